@@ -0,0 +1,163 @@
+import argparse
+import itertools
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from helper import get_packed_data
+from txtdata import TxtData
+
+#Constants
+DEFAULT_ERROR_CORRECTION = 0.0
+DEFAULT_CHUNKSIZE = 64
+MAX_PENDING_PER_WORKER = 2
+CANDIDATE_EXTENSION = ".txt"
+
+BatchResult = namedtuple("BatchResult", ["path", "corrupted", "mismatch_rate", "error"])
+
+# Reference code loaded once in every worker process by _init_worker
+_reference = None
+
+
+def list_candidates(source):
+    '''
+    Lists the candidate files to check, either every .txt file inside a directory
+    or every non-empty line of a manifest file.
+    Parameters:
+        source (str): Path to a directory or to a manifest with one file path per line.
+    Returns:
+        (list): Paths of the candidate files.
+    Examples:
+    >>> list_candidates("scans")
+    ['scans/scan_0001.txt', 'scans/scan_0002.txt']
+    '''
+    if os.path.isdir(source):
+        return [os.path.join(source, name) for name in sorted(os.listdir(source))
+                if name.endswith(CANDIDATE_EXTENSION)]
+    with open(source, 'r') as manifest:
+        return [line.strip() for line in manifest if line.strip()]
+
+
+def compare_to_reference(reference, file_path, error_correction):
+    '''
+    Compares one candidate file with a reference code.
+    Parameters:
+        reference (TxtData): The precise QR code.
+        file_path (str): Path to the candidate QR code file.
+        error_correction (float): The maximum allowed mismatch rate.
+    Returns:
+        (BatchResult): The verdict for the file. mismatch_rate is None when the
+            dimensions differ, a row is too short or the file could not be read,
+            error holds the reason.
+    Examples:
+    >>> reference = TxtData(get_packed_data("qrcode_binary.txt"), packed=True)
+    >>> compare_to_reference(reference, "qrcode_binary_copy.txt", 0.1)
+    BatchResult(path='qrcode_binary_copy.txt', corrupted=False, mismatch_rate=0.0, error=None)
+    '''
+    try:
+        candidate = TxtData(get_packed_data(file_path), packed=True, copy=False)
+    except (OSError, ValueError) as error:
+        return BatchResult(file_path, True, None, str(error))
+
+    if reference.rows != candidate.rows or reference.cols != candidate.cols:
+        return BatchResult(file_path, True, None, "Dimensions do not match!")
+
+    try:
+        mismatch_rate = reference.count_mismatches(candidate) / reference.get_pixels()
+    except IndexError:
+        return BatchResult(file_path, True, None, "Rows are shorter than the reference!")
+    return BatchResult(file_path, mismatch_rate > error_correction, mismatch_rate, None)
+
+
+def _init_worker(reference_path):
+    # Parses the reference once per worker instead of once per candidate
+    global _reference
+    _reference = TxtData(get_packed_data(reference_path), packed=True, copy=False)
+
+
+def _check_chunk(args):
+    file_paths, error_correction = args
+    return [compare_to_reference(_reference, file_path, error_correction) for file_path in file_paths]
+
+
+def _bounded_map(executor, function, jobs, max_pending):
+    # Unlike executor.map, submits a new job only once an earlier one is collected
+    pending = deque()
+    for job in jobs:
+        pending.append(executor.submit(function, job))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def check_batch(reference_path, candidates, error_correction=DEFAULT_ERROR_CORRECTION,
+                workers=None, chunksize=DEFAULT_CHUNKSIZE):
+    '''
+    Checks many candidate files against one reference code on a process pool.
+    Parameters:
+        reference_path (str): Path to the precise QR code file.
+        candidates (iterable): Paths of the candidate QR code files.
+        error_correction (float): The maximum allowed mismatch rate. Defaults to 0.0.
+        workers (int): Number of worker processes. Defaults to the number of CPUs.
+        chunksize (int): Number of files sent to a worker at a time. Defaults to 64.
+    Returns:
+        (generator): Yields a BatchResult per candidate, in the order of candidates,
+            as soon as it is ready.
+    Raises:
+        OSError, ValueError: If the reference cannot be read, before any candidate is checked.
+    Examples:
+    >>> for result in check_batch("qrcode_binary.txt", ["qrcode_binary_copy.txt"], 0.1):
+    ...     print(result.corrupted, result.mismatch_rate)
+    False 0.0
+    '''
+    # Validating the reference here rather than in the generator so a bad reference
+    # fails when check_batch is called, not on the first result
+    get_packed_data(reference_path)
+    return _check_batch(reference_path, candidates, error_correction, workers, chunksize)
+
+
+def _check_batch(reference_path, candidates, error_correction, workers, chunksize):
+    candidates = iter(candidates)
+    chunks = iter(lambda: list(itertools.islice(candidates, chunksize)), [])
+    jobs = ((chunk, error_correction) for chunk in chunks)
+    # Only a few chunks are in flight, so manifests of any length stream through
+    max_pending = MAX_PENDING_PER_WORKER * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(reference_path,)) as executor:
+        for results in _bounded_map(executor, _check_chunk, jobs, max_pending):
+            yield from results
+
+
+def main(argv=None):
+    '''
+    Command line entry point. Prints one tab separated line per candidate with its
+    path, verdict and mismatch rate, and returns 1 if any candidate is corrupted.
+    Examples:
+    $ python batch.py qrcode_binary.txt scans/ --error-correction 0.1
+    scans/scan_0001.txt	OK	0.000000
+    scans/scan_0002.txt	CORRUPTED	0.231405
+    '''
+    parser = argparse.ArgumentParser(description="Check QR code files against a reference code.")
+    parser.add_argument("reference", help="path to the precise QR code file")
+    parser.add_argument("candidates", help="directory of QR code files or a manifest listing them")
+    parser.add_argument("--error-correction", type=float, default=DEFAULT_ERROR_CORRECTION,
+                        help="maximum allowed mismatch rate (default: 0.0)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help="files sent to a worker at a time")
+    args = parser.parse_args(argv)
+
+    any_corrupted = False
+    for result in check_batch(args.reference, list_candidates(args.candidates),
+                              args.error_correction, args.workers, args.chunksize):
+        any_corrupted = any_corrupted or result.corrupted
+        if result.error is not None:
+            print(result.path, "ERROR", result.error, sep="\t")
+        else:
+            verdict = "CORRUPTED" if result.corrupted else "OK"
+            print(result.path, verdict, format(result.mismatch_rate, ".6f"), sep="\t")
+    return 1 if any_corrupted else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
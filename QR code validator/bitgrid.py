@@ -0,0 +1,332 @@
+import hashlib
+from array import array
+
+#Constants
+VALID_BITS = (0, 1)
+WIDTH_TYPECODE = 'I'
+DIGEST_SIZE = 16
+
+
+def popcount(value):
+    '''
+    Returns the number of bits set to 1 in a non-negative integer.
+    Examples:
+    >>> popcount(0b1011)
+    3
+    >>> popcount(0)
+    0
+    '''
+    return bin(value).count('1')
+
+
+if hasattr(int, 'bit_count'):
+    popcount = int.bit_count
+
+
+class BitGrid:
+    '''
+    Stores a 2D grid of 0s and 1s with every row packed into a single integer.
+    Column 0 of a row is its most significant bit, so a row read from a file
+    as '0110' is stored as int('0110', 2).
+    Instance Attributes:
+        bits (list): One integer per row holding the packed pixels of that row.
+        widths (array): Number of columns in each row.
+        frozen (bool): True if the grid can no longer be changed.
+        shared (bool): True if bits is shared with another grid and must be copied before a change.
+    '''
+    __slots__ = ('bits', 'widths', 'frozen', 'shared', '_digest')
+
+    def __init__(self, bits, widths):
+        '''
+        Initialises a BitGrid from already packed rows. No copy is made.
+        Parameters:
+            bits (list): One packed integer per row.
+            widths (array): Number of columns in each row.
+        Returns:
+            None (NoneType)
+        Examples:
+        >>> grid = BitGrid([0b101, 0b010], array('I', [3, 3]))
+        >>> grid
+        [[1, 0, 1], [0, 1, 0]]
+        '''
+        self.bits = bits
+        self.widths = widths
+        self.frozen = False
+        self.shared = False
+        self._digest = None
+
+
+    @classmethod
+    def from_lists(cls, nested_list):
+        '''
+        Packs a nested list of 0s and 1s into a new BitGrid.
+        Parameters:
+            nested_list (list): 2D nested list containing only 0s and 1s.
+        Returns:
+            (BitGrid): The packed grid.
+        Raises:
+            ValueError: If a value other than 0 or 1 is found.
+        Examples:
+        >>> BitGrid.from_lists([[1, 0], [0, 1, 1]]).bits
+        [2, 3]
+        >>> BitGrid.from_lists([[1, 2]])
+        Traceback (most recent call last):
+        ValueError: Packed data should contain only 0s and 1s!
+        '''
+        bits = []
+        widths = array(WIDTH_TYPECODE)
+        for row in nested_list:
+            value = 0
+            for val in row:
+                if val not in VALID_BITS:
+                    raise ValueError("Packed data should contain only 0s and 1s!")
+                # Any value equal to 1, such as True or 1.0, sets the bit
+                value <<= 1
+                if val:
+                    value |= 1
+            bits.append(value)
+            widths.append(len(row))
+        return cls(bits, widths)
+
+
+    def copy(self):
+        '''
+        Returns an independent copy of the grid in O(1). Both grids share their rows
+        until one of them is changed, which then copies the rows it changes first.
+        Examples:
+        >>> grid = BitGrid.from_lists([[1, 0]])
+        >>> other = grid.copy()
+        >>> other[0][0] = 0
+        >>> grid[0][0]
+        1
+        '''
+        self.shared = True
+        return self.view()
+
+
+    def freeze(self):
+        '''
+        Makes the grid immutable so it can be shared safely, and returns it.
+        Examples:
+        >>> grid = BitGrid.from_lists([[1, 0]]).freeze()
+        >>> grid[0][0] = 0
+        Traceback (most recent call last):
+        TypeError: Frozen grids cannot be changed!
+        '''
+        self.frozen = True
+        return self
+
+
+    def view(self):
+        '''
+        Returns a new mutable grid that shares the rows of this one without copying them.
+        The rows are only copied the first time the view is changed.
+        Examples:
+        >>> grid = BitGrid.from_lists([[1, 0]]).freeze()
+        >>> other = grid.view()
+        >>> other.bits is grid.bits
+        True
+        >>> other[0][0] = 0
+        >>> grid[0][0], other[0][0]
+        (1, 0)
+        '''
+        grid = BitGrid(self.bits, self.widths)
+        grid.shared = True
+        grid._digest = self._digest
+        return grid
+
+
+    def digest(self):
+        '''
+        Returns a content digest of the grid with the number of rows and the width
+        of every row folded in. It is computed once and cached until a pixel changes.
+        Returns:
+            (bytes): A 16 byte BLAKE2b digest.
+        Examples:
+        >>> grid = BitGrid.from_lists([[1, 0], [0, 1]])
+        >>> grid.digest() == BitGrid.from_lists([[1, 0], [0, 1]]).digest()
+        True
+        >>> grid.digest() == BitGrid.from_lists([[1, 0, 0, 1]]).digest()
+        False
+        '''
+        if self._digest is None:
+            hasher = hashlib.blake2b(len(self.bits).to_bytes(8, 'little'), digest_size=DIGEST_SIZE)
+            for bits, width in zip(self.bits, self.widths):
+                hasher.update(width.to_bytes(4, 'little'))
+                hasher.update(bits.to_bytes((width + 7) // 8, 'little'))
+            self._digest = hasher.digest()
+        return self._digest
+
+
+    def to_lists(self):
+        '''
+        Unpacks the grid into a new nested list of integers.
+        Examples:
+        >>> BitGrid.from_lists([[1, 0], [1]]).to_lists()
+        [[1, 0], [1]]
+        '''
+        return [list(row) for row in self]
+
+
+    def fit_rows(self, cols):
+        '''
+        Returns every packed row truncated or padded on the right with 0s to exactly cols pixels.
+        Parameters:
+            cols (int): Number of columns wanted.
+        Returns:
+            (generator): Yields one packed integer per row.
+        Examples:
+        >>> list(BitGrid.from_lists([[1, 1, 1], [1]]).fit_rows(2))
+        [3, 2]
+        '''
+        for bits, width in zip(self.bits, self.widths):
+            if width > cols:
+                bits >>= width - cols
+            elif width < cols:
+                bits <<= cols - width
+            yield bits
+
+
+    def count_mismatches(self, other, cols, limit=None):
+        '''
+        Counts the pixels that differ between two grids within the first cols
+        columns of every row, by XOR-ing packed rows and counting the set bits.
+        Parameters:
+            other (BitGrid): The grid to compare with. Must have as many rows.
+            cols (int): Number of leading columns of each row to compare.
+            limit (int): Stops counting as soon as the count exceeds this value.
+                Defaults to None, which always counts the whole grid.
+        Returns:
+            (int): Number of differing pixels, or the partial count once it exceeds limit.
+        Examples:
+        >>> grid = BitGrid.from_lists([[1, 0, 1], [0, 1, 0]])
+        >>> grid.count_mismatches(BitGrid.from_lists([[1, 0, 1], [1, 0, 0]]), 3)
+        2
+        >>> grid.count_mismatches(BitGrid.from_lists([[0, 1, 0], [1, 0, 1]]), 3, 2)
+        3
+        '''
+        count = 0
+        for bits, width, other_bits, other_width in \
+                zip(self.bits, self.widths, other.bits, other.widths):
+            if width < cols or other_width < cols:
+                raise IndexError("Column index out of range")
+            # Dropping any columns past cols before comparing the rows
+            if width != cols:
+                bits >>= width - cols
+            if other_width != cols:
+                other_bits >>= other_width - cols
+            count += popcount(bits ^ other_bits)
+            if limit is not None and count > limit:
+                break
+        return count
+
+
+    def __len__(self):
+        return len(self.bits)
+
+
+    def __getitem__(self, row):
+        '''
+        Returns a BitRow view of the row at the given index. The view reads
+        and writes the grid directly and does not copy the row.
+        '''
+        if row < 0:
+            row += len(self.bits)
+        if row < 0 or row >= len(self.bits):
+            raise IndexError("Row index out of range")
+        return BitRow(self, row)
+
+
+    def __iter__(self):
+        for row in range(len(self.bits)):
+            yield BitRow(self, row)
+
+
+    def __eq__(self, other):
+        if isinstance(other, BitGrid):
+            # Cached digests that differ prove the grids differ without comparing rows
+            if self._digest is not None and other._digest is not None \
+                    and self._digest != other._digest:
+                return False
+            return self.bits == other.bits and self.widths == other.widths
+        try:
+            if len(other) != len(self.bits):
+                return False
+            return all(row == other_row for row, other_row in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+
+    def __repr__(self):
+        return repr(self.to_lists())
+
+
+class BitRow:
+    '''
+    A view of one row of a BitGrid that behaves like a list of 0s and 1s.
+    Instance Attributes:
+        grid (BitGrid): The grid the row belongs to.
+        index (int): Index of the row inside the grid.
+    '''
+    __slots__ = ('grid', 'index')
+
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+
+
+    def __len__(self):
+        return self.grid.widths[self.index]
+
+
+    def _shift(self, col):
+        # Converts a column index into the bit offset from the right
+        width = self.grid.widths[self.index]
+        if col < 0:
+            col += width
+        if col < 0 or col >= width:
+            raise IndexError("Column index out of range")
+        return width - 1 - col
+
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            return list(self)[col]
+        return (self.grid.bits[self.index] >> self._shift(col)) & 1
+
+
+    def __setitem__(self, col, value):
+        grid = self.grid
+        if grid.frozen:
+            raise TypeError("Frozen grids cannot be changed!")
+        if value not in VALID_BITS:
+            raise ValueError("Packed data should contain only 0s and 1s!")
+        mask = 1 << self._shift(col)
+        # Taking a private copy of shared rows before the first change
+        if grid.shared:
+            grid.bits = grid.bits[:]
+            grid.shared = False
+        grid._digest = None
+        bits = grid.bits
+        if value:
+            bits[self.index] |= mask
+        else:
+            bits[self.index] &= ~mask
+
+
+    def __iter__(self):
+        width = self.grid.widths[self.index]
+        if width == 0:
+            return iter(())
+        return map(int, format(self.grid.bits[self.index], '0' + str(width) + 'b'))
+
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+
+    def __repr__(self):
+        return repr(list(self))
@@ -0,0 +1,114 @@
+import os
+from collections import OrderedDict
+from helper import get_packed_data
+
+#Constants
+DEFAULT_MAXSIZE = 256
+
+class GridCache:
+    '''
+    Bounded least recently used cache of parsed QR code files. Grids are frozen so
+    every QRCode and TxtData built from them can share them without copying.
+    An entry is reparsed when the size or modification time of its file changes.
+    Instance Attributes:
+        maxsize (int): Maximum number of files kept.
+        entries (OrderedDict): Maps a file path to its ((size, mtime), grid) pair,
+            least recently used first.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to parse the file.
+        evictions (int): Number of entries dropped to stay within maxsize.
+    '''
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        '''
+        Creates an empty cache.
+        Parameters:
+            maxsize (int): Maximum number of files kept. Defaults to 256.
+        Returns:
+            None (NoneType)
+        Examples:
+        >>> cache = GridCache(2)
+        >>> cache.stats()
+        {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'maxsize': 2}
+        '''
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def get(self, file_path):
+        '''
+        Returns the parsed grid of a file, parsing it only if it is not cached
+        or has changed since it was cached.
+        Parameters:
+            file_path (str): The path to the file.
+        Returns:
+            (BitGrid): The frozen grid of the file, with its digest already computed.
+        Raises:
+            ValueError: If the file contains anything other than 0s and 1s.
+        Examples:
+        >>> cache = GridCache()
+        >>> cache.get("qrcode_binary.txt") is cache.get("qrcode_binary.txt")
+        True
+        >>> cache.hits, cache.misses
+        (1, 1)
+        '''
+        stat = os.stat(file_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        entry = self.entries.get(file_path)
+        if entry is not None and entry[0] == signature:
+            self.hits += 1
+            self.entries.move_to_end(file_path)
+            return entry[1]
+
+        self.misses += 1
+        grid = get_packed_data(file_path)
+        # Hashing once here lets every view of the grid inherit the digest
+        grid.digest()
+        grid.freeze()
+        self.entries[file_path] = (signature, grid)
+        self.entries.move_to_end(file_path)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return grid
+
+
+    def stats(self):
+        '''
+        Returns the hit, miss and eviction counts with the current and maximum size.
+        Returns:
+            (dict): Statistics with keys 'hits', 'misses', 'evictions', 'size' and 'maxsize'.
+        '''
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self.entries), "maxsize": self.maxsize}
+
+
+    def clear(self):
+        '''
+        Drops every entry and resets the statistics.
+        '''
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+# Cache shared by QRCode objects
+DEFAULT_CACHE = GridCache()
+
+
+def get_cached_data(file_path):
+    '''
+    Returns the frozen grid of a file from the shared cache.
+    Parameters:
+        file_path (str): The path to the file.
+    Returns:
+        (BitGrid): The frozen grid of the file.
+    Examples:
+    >>> get_cached_data("small_data.txt")
+    [[0, 1], [1, 0]]
+    '''
+    return DEFAULT_CACHE.get(file_path)
@@ -1,8 +1,13 @@
+import mmap
+import os
+from array import array
+from bitgrid import BitGrid, WIDTH_TYPECODE
+
 #CONSTANTS
 DAY_LENGTH = 2
 MONTH_LENGTH = 2
 YEAR_LENGTH = 4
-VALID_BINARY_CHARS = ['0', '1']
+VALID_BINARY_BYTES = b'01'
 
 def convert_date(date_str):
     """
@@ -49,14 +54,71 @@ def get_data(file_path):
     >>> get_data("small_data.txt")
     [[0, 1], [1, 0]]
     """
-    nested_list = []
-    with open(file_path,'r') as file:
-        for line in file:
-            row = []
-            for char in line.strip():
-                # Checking if characters are 0s and 1s
-                if char not in VALID_BINARY_CHARS:
-                    raise ValueError("File should contain only 0s and 1s!")
-                row.append(int(char))
-            nested_list.append(row)
-    return nested_list
+    return get_packed_data(file_path).to_lists()
+
+
+def pack_lines(lines):
+    """
+    Validates and packs lines of 0s and 1s one whole line at a time, \
+    raises a ValueError if a line contains anything else.
+    Parameters:
+        lines (iterable): Lines of the file as bytes
+    Returns:
+        (generator): Yields (bits, width) for each line, where bits is the line read as a base 2 integer
+    Examples:
+    >>> list(pack_lines([b'0110\\n', b'1\\n', b'\\n']))
+    [(6, 4), (1, 1), (0, 0)]
+    >>> list(pack_lines([b'0120\\n']))
+    Traceback (most recent call last):
+    ValueError: File should contain only 0s and 1s!
+    """
+    for line in lines:
+        line = line.strip()
+        # Deleting every valid character leaves nothing behind for a valid line
+        if line.translate(None, VALID_BINARY_BYTES):
+            raise ValueError("File should contain only 0s and 1s!")
+        yield (int(line, 2) if line else 0), len(line)
+
+
+def iter_packed_rows(file_path):
+    """
+    Lazily reads a file row by row, for grids too large to hold in memory.
+    Parameters:
+        file_path(string): The path to the file
+    Returns:
+        (generator): Yields (bits, width) for each row of the file
+    Examples:
+    >>> for bits, width in iter_packed_rows("small_data.txt"):
+    ...     print(bits, width)
+    1 2
+    2 2
+    """
+    with open(file_path, 'rb') as file:
+        yield from pack_lines(file)
+
+
+def get_packed_data(file_path):
+    """
+    Reads a file through a memory map and returns its rows packed into a BitGrid \
+    if the file contains only 0s and 1s, raises a ValueError if otherwise.
+    Parameters:
+        file_path(string): The path to the file
+    Returns:
+        (BitGrid): Packed rows of 0s and 1s inside the file
+    Examples:
+    >>> get_packed_data("small_data.txt")
+    [[0, 1], [1, 0]]
+    >>> get_packed_data("small_data.txt").bits
+    [1, 2]
+    """
+    bits = []
+    widths = array(WIDTH_TYPECODE)
+    with open(file_path, 'rb') as file:
+        # Empty files cannot be memory mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            return BitGrid(bits, widths)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            for row_bits, width in pack_lines(iter(buffer.readline, b'')):
+                bits.append(row_bits)
+                widths.append(width)
+    return BitGrid(bits, widths)
@@ -1,4 +1,6 @@
-from helper import convert_date, get_data
+from helper import convert_date
+from gridcache import get_cached_data
+from regions import DEFAULT_QUIET_ZONE, DEFAULT_BAND_SIZE, diff_regions
 from txtdata import TxtData
 
 #Constants
@@ -63,8 +65,8 @@ class QRCode:
         0.15
         """
 
-        # Creates a TxtData object from the file
-        self.data = TxtData(get_data(file_path)) 
+        # Creates a packed TxtData object sharing the cached grid of the file
+        self.data = TxtData(get_cached_data(file_path), packed=True)
         self.last_update_date = convert_date(last_update_date)  
         self.owner = owner
         self.error_correction = error_correction
@@ -145,3 +147,28 @@ class QRCode:
         """
 
         return not self.data.approximately_equals(precise_qrcode.data, self.error_correction)
+
+
+    def corruption_report(self, precise_qrcode, quiet_zone=DEFAULT_QUIET_ZONE, band_size=DEFAULT_BAND_SIZE,\
+                          reject_on_finder=False):
+        """
+        Reports where the QRCode object differs from a precise QRCode object, with mismatch counts
+        for the finder patterns, timing patterns, quiet zone and data area and for bands of rows and columns.
+        Parameters:
+            precise_qrcode (QRCode): A QRCode object representing the precise version of the QR code.
+            quiet_zone (int): Width of the blank border around the symbol. Defaults to 4.
+            band_size (int): Number of rows or columns in a band. Defaults to 8.
+            reject_on_finder (bool): Stops before counting the rest of the code if the finder
+                patterns differ. Defaults to False.
+        Returns:
+            (RegionReport): The mismatch counts, see regions.diff_regions.
+        Raises:
+            ValueError: If the dimensions of the two QR codes do not match.
+        Examples:
+        >>> precise_qrcode = QRCode("qrcode_binary.txt", "01/09/2024", "Alice", 0.1)
+        >>> corrupted_qrcode = QRCode("qrcode_corrupted.txt", "25/12/2022", "Carol", 0.15)
+        >>> corrupted_qrcode.corruption_report(precise_qrcode).regions
+        {'finder': 0, 'timing': 0, 'quiet_zone': 0, 'data': 61}
+        """
+
+        return diff_regions(self.data, precise_qrcode.data, quiet_zone, band_size, reject_on_finder)
@@ -0,0 +1,201 @@
+from txtdata import TxtData, mismatch_limit
+
+class DigestIndex:
+    '''
+    In-memory index of TxtData objects keyed by their content digest, answering
+    whether an identical code has been seen before in O(1) per code.
+    Instance Attributes:
+        entries (dict): Maps a digest to the list of (TxtData, label) pairs stored under it.
+    '''
+
+    def __init__(self):
+        '''
+        Creates an empty index.
+        Examples:
+        >>> index = DigestIndex()
+        >>> len(index)
+        0
+        '''
+        self.entries = {}
+
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.entries.values())
+
+
+    def __contains__(self, txt_data):
+        return self.find(txt_data) is not None
+
+
+    def find(self, txt_data):
+        '''
+        Looks up a stored code equal to txt_data.
+        Parameters:
+            txt_data (TxtData): The code to look up.
+        Returns:
+            (tuple): The stored (TxtData, label) pair, or None if no equal code was added.
+        Examples:
+        >>> index = DigestIndex()
+        >>> index.add(TxtData([[1, 0], [0, 1]], packed=True), "first")
+        True
+        >>> index.find(TxtData([[1, 0], [0, 1]], packed=True))[1]
+        'first'
+        >>> index.find(TxtData([[1, 1], [0, 1]], packed=True)) is None
+        True
+        '''
+        # Confirming with equals guards against digest collisions
+        for entry in self.entries.get(txt_data.get_digest(), ()):
+            if entry[0].equals(txt_data):
+                return entry
+        return None
+
+
+    def add(self, txt_data, label=None):
+        '''
+        Adds a code to the index unless an equal code is already stored.
+        Parameters:
+            txt_data (TxtData): The code to add.
+            label (object): Any value to keep with the code, such as its file path.
+        Returns:
+            (bool): True if the code was new, False if it was a duplicate.
+        Examples:
+        >>> index = DigestIndex()
+        >>> index.add(TxtData([[1, 0]], packed=True))
+        True
+        >>> index.add(TxtData([[1, 0]], packed=True))
+        False
+        '''
+        if self.find(txt_data) is not None:
+            return False
+        self.entries.setdefault(txt_data.get_digest(), []).append((txt_data, label))
+        return True
+
+
+def deduplicate(codes):
+    '''
+    Drops every code equal to one earlier in the sequence.
+    Parameters:
+        codes (iterable): TxtData objects.
+    Returns:
+        (generator): Yields the first occurrence of each distinct code, in order.
+    Examples:
+    >>> codes = [TxtData([[1]], packed=True), TxtData([[0]], packed=True), TxtData([[1]], packed=True)]
+    >>> [code.data for code in deduplicate(codes)]
+    [[[1]], [[0]]]
+    '''
+    index = DigestIndex()
+    for txt_data in codes:
+        if index.add(txt_data):
+            yield txt_data
+
+
+class HammingIndex:
+    '''
+    BK-tree over TxtData objects using the number of differing pixels as the distance,
+    so every stored code close to a query is found without comparing against all of them.
+    Codes are kept in a separate tree for each size since only codes of equal size compare.
+    Instance Attributes:
+        trees (dict): Maps (rows, cols) to the root node of the tree for codes of that size.
+            A node is a list [txt_data, label, children] where children maps a distance
+            to the child node.
+        size (int): Number of codes stored.
+    '''
+
+    def __init__(self):
+        '''
+        Creates an empty index.
+        Examples:
+        >>> index = HammingIndex()
+        >>> len(index)
+        0
+        '''
+        self.trees = {}
+        self.size = 0
+
+
+    def __len__(self):
+        return self.size
+
+
+    def add(self, txt_data, label=None):
+        '''
+        Adds a code to the index.
+        Parameters:
+            txt_data (TxtData): The code to add.
+            label (object): Any value to keep with the code, such as its file path.
+        Returns:
+            None (NoneType)
+        Examples:
+        >>> index = HammingIndex()
+        >>> index.add(TxtData([[1, 0], [0, 1]], packed=True), "original")
+        >>> len(index)
+        1
+        '''
+        self.size += 1
+        key = (txt_data.rows, txt_data.cols)
+        node = self.trees.get(key)
+        if node is None:
+            self.trees[key] = [txt_data, label, {}]
+            return
+        while True:
+            distance = node[0].count_mismatches(txt_data)
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [txt_data, label, {}]
+                return
+            node = child
+
+
+    def search(self, query, precision):
+        '''
+        Finds every stored code whose inconsistency rate with the query is within precision,
+        the same test approximately_equals applies to a single pair.
+        Parameters:
+            query (TxtData): The code to match, such as a scan.
+            precision (float): The maximum allowed inconsistency rate.
+        Returns:
+            (list): (distance, txt_data, label) tuples, closest first.
+        Examples:
+        >>> index = HammingIndex()
+        >>> index.add(TxtData([[1, 0, 1], [0, 1, 0]], packed=True), "a")
+        >>> index.add(TxtData([[0, 1, 0], [1, 0, 1]], packed=True), "b")
+        >>> [(distance, label) for distance, _, label in index.search(TxtData([[1, 0, 1], [1, 1, 0]], packed=True), 0.2)]
+        [(1, 'a')]
+        '''
+        root = self.trees.get((query.rows, query.cols))
+        if root is None:
+            return []
+        total_pixels = query.get_pixels()
+        radius = mismatch_limit(precision, total_pixels)
+
+        results = []
+        stack = [root]
+        while stack:
+            txt_data, label, children = stack.pop()
+            distance = txt_data.count_mismatches(query)
+            if distance / total_pixels <= precision:
+                results.append((distance, txt_data, label))
+            # By the triangle inequality only these subtrees can hold a match
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        results.sort(key=lambda result: result[0])
+        return results
+
+
+    def nearest(self, query, precision):
+        '''
+        Finds the stored code most likely to be the original of a scan.
+        Parameters:
+            query (TxtData): The code to match.
+            precision (float): The maximum allowed inconsistency rate.
+        Returns:
+            (tuple): The closest (distance, txt_data, label) within precision, or None.
+        Examples:
+        >>> index = HammingIndex()
+        >>> index.add(TxtData([[1, 0], [0, 1]], packed=True), "a")
+        >>> index.nearest(TxtData([[1, 1], [1, 1]], packed=True), 0.25) is None
+        True
+        '''
+        results = self.search(query, precision)
+        return results[0] if results else None
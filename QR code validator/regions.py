@@ -0,0 +1,150 @@
+from collections import namedtuple
+from functools import lru_cache
+from bitgrid import BitGrid, popcount
+
+#Constants
+DEFAULT_QUIET_ZONE = 4
+DEFAULT_BAND_SIZE = 8
+FINDER_SIZE = 8
+TIMING_INDEX = 6
+REGIONS = ("finder", "timing", "quiet_zone", "data")
+
+RegionReport = namedtuple("RegionReport", ["regions", "row_bands", "col_bands", "total",
+                                           "finder_rejected"])
+
+
+def _span(start, stop, cols):
+    # Mask of the columns start to stop - 1 of a packed row, column 0 being the top bit
+    if stop <= start:
+        return 0
+    return ((1 << (stop - start)) - 1) << (cols - stop)
+
+
+@lru_cache(maxsize=None)
+def region_masks(rows, cols, quiet_zone=DEFAULT_QUIET_ZONE):
+    '''
+    Builds a mask of every structural region of a QR code for each row of a packed grid.
+    Finder patterns include their separators, so each covers an 8x8 square.
+    Results are cached for every size.
+    Parameters:
+        rows (int): Number of rows of the grid, quiet zone included.
+        cols (int): Number of columns of the grid, quiet zone included.
+        quiet_zone (int): Width of the blank border around the symbol. Defaults to 4.
+    Returns:
+        (dict): Maps each name in REGIONS to a tuple of one mask per row.
+    Raises:
+        ValueError: If the quiet zone leaves no room for the symbol.
+    Examples:
+    >>> masks = region_masks(21, 21, 0)
+    >>> format(masks["finder"][0], "021b")
+    '111111110000011111111'
+    >>> format(masks["timing"][6], "021b")
+    '000000001111100000000'
+    '''
+    symbol_rows = rows - 2 * quiet_zone
+    symbol_cols = cols - 2 * quiet_zone
+    if quiet_zone < 0 or symbol_rows <= 0 or symbol_cols <= 0:
+        raise ValueError("Quiet zone leaves no room for the symbol!")
+
+    full = (1 << cols) - 1
+    symbol = _span(quiet_zone, cols - quiet_zone, cols)
+    left_finder = _span(quiet_zone, quiet_zone + FINDER_SIZE, cols)
+    right_finder = _span(cols - quiet_zone - FINDER_SIZE, cols - quiet_zone, cols)
+    timing_column = _span(quiet_zone + TIMING_INDEX, quiet_zone + TIMING_INDEX + 1, cols)
+    # Timing patterns run along row and column 6 of the symbol between the finder patterns
+    timing_row = _span(quiet_zone + FINDER_SIZE, cols - quiet_zone - FINDER_SIZE, cols)
+
+    masks = {name: [] for name in REGIONS}
+    for r in range(rows):
+        y = r - quiet_zone
+        if y < 0 or y >= symbol_rows:
+            quiet, finder, timing = full, 0, 0
+        else:
+            quiet = full & ~symbol
+            finder = 0
+            if y < FINDER_SIZE:
+                finder = left_finder | right_finder
+            elif y >= symbol_rows - FINDER_SIZE:
+                finder = left_finder
+            if y == TIMING_INDEX:
+                timing = timing_row
+            elif FINDER_SIZE <= y < symbol_rows - FINDER_SIZE:
+                timing = timing_column
+            else:
+                timing = 0
+            timing &= ~finder
+        masks["quiet_zone"].append(quiet)
+        masks["finder"].append(finder)
+        masks["timing"].append(timing)
+        masks["data"].append(full & ~(quiet | finder | timing))
+    return {name: tuple(row_masks) for name, row_masks in masks.items()}
+
+
+def diff_regions(txt_data, another_data, quiet_zone=DEFAULT_QUIET_ZONE,
+                 band_size=DEFAULT_BAND_SIZE, reject_on_finder=False):
+    '''
+    Counts the pixels that differ between two codes for each structural region and for
+    each band of rows and of columns, in one pass over the packed rows.
+    Parameters:
+        txt_data (TxtData): The code to check.
+        another_data (TxtData): The code to compare with, of the same size.
+        quiet_zone (int): Width of the blank border around the symbol. Defaults to 4.
+        band_size (int): Number of rows or columns in a band. Defaults to 8.
+        reject_on_finder (bool): Stops before counting anything else if the finder
+            patterns differ. Defaults to False.
+    Returns:
+        (RegionReport): regions maps each name in REGIONS to its mismatch count,
+            row_bands and col_bands list the counts of each band, total is the overall count
+            and finder_rejected tells whether counting stopped at the finder patterns.
+    Raises:
+        ValueError: If the dimensions of the two codes do not match.
+    Examples:
+    >>> from txtdata import TxtData
+    >>> blank = TxtData([[0] * 21 for _ in range(21)], packed=True)
+    >>> damaged = TxtData([[0] * 21 for _ in range(21)], packed=True)
+    >>> damaged.data[0][0] = 1
+    >>> damaged.data[10][10] = 1
+    >>> report = diff_regions(blank, damaged, 0)
+    >>> report.regions
+    {'finder': 1, 'timing': 0, 'quiet_zone': 0, 'data': 1}
+    >>> report.row_bands, report.col_bands
+    ([1, 1, 0], [1, 1, 0])
+    >>> diff_regions(blank, damaged, 0, reject_on_finder=True).finder_rejected
+    True
+    '''
+    rows, cols = txt_data.rows, txt_data.cols
+    if rows != another_data.rows or cols != another_data.cols:
+        raise ValueError("Dimensions do not match!")
+    masks = region_masks(rows, cols, quiet_zone)
+
+    grid = txt_data.data if isinstance(txt_data.data, BitGrid) else BitGrid.from_lists(txt_data.data)
+    other = another_data.data if isinstance(another_data.data, BitGrid) \
+        else BitGrid.from_lists(another_data.data)
+    diffs = [bits ^ other_bits for bits, other_bits in zip(grid.fit_rows(cols), other.fit_rows(cols))]
+
+    regions = dict.fromkeys(REGIONS, 0)
+    row_bands = [0] * ((rows + band_size - 1) // band_size)
+    col_bands = [0] * ((cols + band_size - 1) // band_size)
+
+    # Finder patterns only sit in the top and bottom rows, so they are checked first
+    finder_masks = masks["finder"]
+    regions["finder"] = sum(popcount(diff & mask) for diff, mask in zip(diffs, finder_masks) if mask)
+    if reject_on_finder and regions["finder"]:
+        return RegionReport(regions, None, None, None, True)
+
+    col_band_masks = [_span(start, min(start + band_size, cols), cols)
+                      for start in range(0, cols, band_size)]
+    timing_masks, quiet_masks = masks["timing"], masks["quiet_zone"]
+    total = 0
+    for r, diff in enumerate(diffs):
+        if not diff:
+            continue
+        count = popcount(diff)
+        total += count
+        row_bands[r // band_size] += count
+        regions["timing"] += popcount(diff & timing_masks[r])
+        regions["quiet_zone"] += popcount(diff & quiet_masks[r])
+        for band, mask in enumerate(col_band_masks):
+            col_bands[band] += popcount(diff & mask)
+    regions["data"] = total - regions["finder"] - regions["timing"] - regions["quiet_zone"]
+    return RegionReport(regions, row_bands, col_bands, total, False)
@@ -0,0 +1,104 @@
+import struct
+import zlib
+
+#Constants
+BLOCK_CHAR = "\u2588\u2588"
+SPACE_CHAR = "  "
+PGM_MAXVAL = 255
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_BIT_DEPTH = 1
+PNG_GRAYSCALE = 0
+
+# Maps every byte of a packed row to the 8 pixels it holds, most significant bit first
+TEXT_TABLE = [''.join(BLOCK_CHAR if byte >> (7 - i) & 1 else SPACE_CHAR for i in range(8))
+              for byte in range(256)]
+# Maps every byte of a packed row to 8 PGM samples, 1s being black
+PGM_TABLE = [bytes(0 if byte >> (7 - i) & 1 else PGM_MAXVAL for i in range(8))
+             for byte in range(256)]
+
+
+def _row_bytes(bits, width):
+    # Left aligns a packed row on a byte boundary, padding with 0s
+    nbytes = (width + 7) // 8
+    return (bits << (nbytes * 8 - width)).to_bytes(nbytes, 'big')
+
+
+def render_text(grid):
+    '''
+    Renders a grid as text, 1s as two block characters and 0s as two spaces,
+    one line per row.
+    Parameters:
+        grid (BitGrid): The packed grid.
+    Returns:
+        (str): The rendered grid, every line ending with a newline.
+    Examples:
+    >>> from bitgrid import BitGrid
+    >>> render_text(BitGrid.from_lists([[1, 0], [0, 1]])) == BLOCK_CHAR + "  \\n  " + BLOCK_CHAR + "\\n"
+    True
+    '''
+    lines = [''.join(map(TEXT_TABLE.__getitem__, _row_bytes(bits, width)))[:2 * width]
+             for bits, width in zip(grid.bits, grid.widths)]
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def render_pbm(grid, cols):
+    '''
+    Renders a grid as a binary PBM (P4) bitmap, 1s being black.
+    Parameters:
+        grid (BitGrid): The packed grid.
+        cols (int): Width of the image. Longer rows are cut and shorter ones padded with 0s.
+    Returns:
+        (bytes): The PBM file contents.
+    Examples:
+    >>> from bitgrid import BitGrid
+    >>> render_pbm(BitGrid.from_lists([[1, 0], [0, 1]]), 2)
+    b'P4\\n2 2\\n\\x80@'
+    '''
+    header = ("P4\n%d %d\n" % (cols, len(grid))).encode('ascii')
+    return header + b''.join(_row_bytes(bits, cols) for bits in grid.fit_rows(cols))
+
+
+def render_pgm(grid, cols):
+    '''
+    Renders a grid as a binary PGM (P5) greymap, 1s being black and 0s white.
+    Parameters:
+        grid (BitGrid): The packed grid.
+        cols (int): Width of the image. Longer rows are cut and shorter ones padded with 0s.
+    Returns:
+        (bytes): The PGM file contents.
+    Examples:
+    >>> from bitgrid import BitGrid
+    >>> render_pgm(BitGrid.from_lists([[1, 0]]), 2)
+    b'P5\\n2 1\\n255\\n\\x00\\xff'
+    '''
+    header = ("P5\n%d %d\n%d\n" % (cols, len(grid), PGM_MAXVAL)).encode('ascii')
+    rows = [b''.join(map(PGM_TABLE.__getitem__, _row_bytes(bits, cols)))[:cols]
+            for bits in grid.fit_rows(cols)]
+    return header + b''.join(rows)
+
+
+def _png_chunk(chunk_type, payload):
+    return struct.pack(">I", len(payload)) + chunk_type + payload \
+        + struct.pack(">I", zlib.crc32(chunk_type + payload))
+
+
+def render_png(grid, cols):
+    '''
+    Renders a grid as a 1 bit greyscale PNG image, 1s being black and 0s white.
+    Parameters:
+        grid (BitGrid): The packed grid.
+        cols (int): Width of the image. Longer rows are cut and shorter ones padded with 0s.
+    Returns:
+        (bytes): The PNG file contents.
+    Examples:
+    >>> from bitgrid import BitGrid
+    >>> render_png(BitGrid.from_lists([[1, 0], [0, 1]]), 2)[:8] == PNG_SIGNATURE
+    True
+    '''
+    # Greyscale 0 is black, so every row is inverted and starts with filter type 0
+    mask = (1 << cols) - 1
+    raw = b''.join(b'\x00' + _row_bytes(bits ^ mask, cols) for bits in grid.fit_rows(cols))
+    header = struct.pack(">IIBBBBB", cols, len(grid), PNG_BIT_DEPTH, PNG_GRAYSCALE, 0, 0, 0)
+    return PNG_SIGNATURE + _png_chunk(b"IHDR", header) \
+        + _png_chunk(b"IDAT", zlib.compress(raw)) + _png_chunk(b"IEND", b"")
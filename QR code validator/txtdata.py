@@ -1,23 +1,33 @@
-import copy
+import hashlib
+from array import array
+from operator import ne
 from helper import get_data
+from bitgrid import BitGrid, DIGEST_SIZE
+from render import BLOCK_CHAR, SPACE_CHAR, render_text, render_pbm, render_pgm, render_png
 
 #Constants
-BLOCK_CHAR = "\u2588\u2588"
+IMAGE_RENDERERS = {"pbm": render_pbm, "pgm": render_pgm, "png": render_png}
 
 class TxtData:
     '''
     Represents a 2D grid of binary data with operations for analysis, saving, and comparison.
     Instance Attributes:
-        data (list): A nested list of integers representing the binary grid.
+        data (list or BitGrid): A nested list of integers representing the binary grid,
+            or a BitGrid view of the packed rows when created with packed=True.
         rows (int): Number of rows in the binary grid.
         cols (int): Number of columns in the binary grid.
         '''
 
-    def __init__(self, data):
+    def __init__(self, data, packed=False, copy=True):
         '''
-        Creates a deep copy of input data initialises values.
+        Creates a copy of input data initialises values.
         Parameters:
-            data (list): Input 2D nested list.
+            data (list or BitGrid): Input 2D nested list.
+            packed (bool): Stores every row as a packed bitset instead of a list of ints.
+                Requires data to contain only 0s and 1s. Defaults to False.
+                A BitGrid is shared and only copied when one of its pixels changes.
+            copy (bool): Copies a nested list, set to False to hand the list or BitGrid
+                over to the object in O(1) instead. Defaults to True.
         Returns:
             None (NoneType)
         Examples:
@@ -39,10 +49,26 @@ class TxtData:
         3
         >>> my_txt_new.cols
         4
+        >>> my_txt_packed = TxtData([[1, 0, 1], [0, 1, 0]], packed=True)
+        >>> my_txt_packed.data
+        [[1, 0, 1], [0, 1, 0]]
+        >>> owned_list = [[1, 0], [0, 1]]
+        >>> TxtData(owned_list, copy=False).data is owned_list
+        True
         '''
 
-        # Creates a deep copy of the input nested list
-        self.data = [row[:] for row in data]
+        if packed:
+            if isinstance(data, BitGrid):
+                # Copies of a BitGrid share its rows until one of them changes
+                self.data = data.copy() if copy or data.frozen else data
+            else:
+                self.data = BitGrid.from_lists(data)
+            self.data.digest()
+        elif copy:
+            # Creates a copy of the input nested list
+            self.data = [row[:] for row in data]
+        else:
+            self.data = data
         self.rows = len(data)
         self.cols = len(data[0]) if self.rows > 0 else 0
 
@@ -120,14 +146,19 @@ class TxtData:
         return self.data[row][col]
 
 
-    def pretty_save(self, file_name):
+    def pretty_save(self, file_name, file_format="text"):
         '''
         Converts data into a visually readable QR code and saves it to a file.
         '1's are converted into two block characters and '0's into two spaces.
+        Binary data can also be saved as a PBM, PGM or PNG image with '1's in black.
         Parameters:
             file_name (str): Name of the file to save the new data.
+            file_format (str): One of "text", "pbm", "pgm" or "png". Defaults to "text".
         Returns:
             None (NoneType)
+        Raises:
+            ValueError: If the format is unknown, or an image is asked for data
+                containing values other than 0s and 1s.
         Examples:
         >>> list2 = [[1, 0, 1], [0, 1, 0]]
         >>> my_txt_list2 = TxtData(list2)
@@ -136,19 +167,25 @@ class TxtData:
         >>> my_list = get_data("qrcode_binary.txt")
         >>> my_txt = TxtData(my_list)
         >>> my_txt.pretty_save("qrcode_pretty.txt")
+        >>> my_txt.pretty_save("qrcode.png", "png")
         '''
-        
-        with open(file_name, 'w', encoding='utf-8') as f:
-            for row in self.data:
-                line = ""
-                for val in row:
-                    #Saving data as blocks and spaces
-                    if val == 1:
-                        line += BLOCK_CHAR 
-                    else:
-                        line += "  "  
-                line += "\n" 
-                f.write(line)
+
+        if file_format == "text":
+            if isinstance(self.data, BitGrid):
+                text = render_text(self.data)
+            else:
+                #Saving data as blocks and spaces
+                text = ''.join(''.join([BLOCK_CHAR if val == 1 else SPACE_CHAR for val in row]) + "\n"
+                               for row in self.data)
+            with open(file_name, 'w', encoding='utf-8') as f:
+                f.write(text)
+            return
+
+        if file_format not in IMAGE_RENDERERS:
+            raise ValueError("Unknown file format!")
+        grid = self.data if isinstance(self.data, BitGrid) else BitGrid.from_lists(self.data)
+        with open(file_name, 'wb') as f:
+            f.write(IMAGE_RENDERERS[file_format](grid, self.cols))
 
 
     def equals(self, another_data):
@@ -211,15 +248,109 @@ class TxtData:
         if self.rows != another_data.rows or self.cols != another_data.cols:
             return False 
 
-        # Counting inconsistent values
-        inconsistent_count = 0
+        # Counting inconsistent values, giving up once the precision can no longer be met
         total_pixels = self.get_pixels()
-
-        for i in range(self.rows):
-            for j in range(self.cols):
-                if self.data[i][j] != another_data.data[i][j]:
-                    inconsistent_count += 1
+        inconsistent_count = self.count_mismatches(another_data, mismatch_limit(precision, total_pixels))
 
         # Calculating inconsistency rate
         inconsistency_rate = inconsistent_count / total_pixels
         return inconsistency_rate <= precision
+
+
+    def count_mismatches(self, another_data, limit=None):
+        '''
+        Counts the positions inside the first rows x cols pixels where the two TxtData
+        objects differ. Packed grids are compared with XOR and popcount, nested lists
+        row by row.
+        Parameters:
+            another_data (TxtData): The other TxtData object to compare with.
+                Must have the same number of rows.
+            limit (int): Stops counting as soon as the count exceeds this value.
+                Defaults to None, which always counts every pixel.
+        Returns:
+            (int): Number of inconsistent values, or the partial count once it exceeds limit.
+        Raises:
+            IndexError: If a row is shorter than cols.
+        Examples:
+        >>> my_txt = TxtData([[1, 0, 1], [0, 1, 0]], packed=True)
+        >>> my_txt.count_mismatches(TxtData([[1, 0, 1], [1, 0, 0]], packed=True))
+        2
+        >>> TxtData([[6, 7, 9], [8, 9, 1]]).count_mismatches(TxtData([[5, 7, 3], [4, 9, 0]]))
+        4
+        '''
+        if isinstance(self.data, BitGrid) and isinstance(another_data.data, BitGrid):
+            return self.data.count_mismatches(another_data.data, self.cols, limit)
+
+        cols = self.cols
+        inconsistent_count = 0
+        for row, other_row in zip(self.data, another_data.data):
+            if len(row) < cols or len(other_row) < cols:
+                raise IndexError("Column index out of range")
+            inconsistent_count += sum(map(ne, row[:cols], other_row[:cols]))
+            if limit is not None and inconsistent_count > limit:
+                break
+        return inconsistent_count
+
+
+    def get_digest(self):
+        '''
+        Returns a content digest of the grid, with its dimensions folded in.
+        Packed data computes the digest when the object is built and keeps it until a
+        pixel changes. Nested lists can be changed freely, so they are hashed on every call.
+        Returns:
+            (bytes): A 16 byte digest, equal for any two TxtData objects that are equal
+                within the same process.
+        Examples:
+        >>> my_txt = TxtData([[1, 0, 1], [0, 1, 0]], packed=True)
+        >>> my_txt.get_digest() == TxtData([[1, 0, 1], [0, 1, 0]]).get_digest()
+        True
+        >>> my_txt.get_digest() == TxtData([[1, 0, 1], [0, 1, 1]]).get_digest()
+        False
+        >>> TxtData([[7, 8, 6], [8, 3, 9]]).get_digest() == TxtData([[7, 8, 6], [8, 3, 9]]).get_digest()
+        True
+        >>> TxtData([[1.0, 7.0]]).get_digest() == TxtData([[1, 7]]).get_digest()
+        True
+        '''
+        if isinstance(self.data, BitGrid):
+            return self.data.digest()
+        try:
+            # Binary grids hash like their packed form so both modes match
+            return BitGrid.from_lists(self.data).digest()
+        except ValueError:
+            return _list_digest(self.data)
+
+
+def mismatch_limit(precision, total_pixels):
+    '''
+    Returns the mismatch count past which two codes with total_pixels pixels can no longer
+    be within precision of each other, to stop counting early.
+    Parameters:
+        precision (float): The maximum allowed inconsistency rate.
+        total_pixels (int): Number of pixels compared.
+    Returns:
+        (int): A limit between 0 and total_pixels. A precision of 1 or more, infinite or
+            NaN gives total_pixels, so every pixel is counted.
+    Examples:
+    >>> mismatch_limit(0.1, 100)
+    11
+    >>> mismatch_limit(float('inf'), 100), mismatch_limit(float('nan'), 100)
+    (100, 100)
+    '''
+    if not precision < 1:
+        return total_pixels
+    # Rounding up keeps the limit safe from floating point error
+    return min(max(int(precision * total_pixels) + 1, 0), total_pixels)
+
+
+def _list_digest(nested_list):
+    # Hashes the hash of every value, which is equal for equal values such as 1 and 1.0,
+    # with the length of each row keeping rows apart
+    hasher = hashlib.blake2b(len(nested_list).to_bytes(8, 'little'), digest_size=DIGEST_SIZE)
+    for row in nested_list:
+        hasher.update(len(row).to_bytes(8, 'little'))
+        try:
+            hasher.update(array('q', map(hash, row)).tobytes())
+        except TypeError:
+            # Unhashable values fall back on their text
+            hasher.update(repr(list(row)).encode('utf-8'))
+    return hasher.digest()
@@ -6,8 +6,34 @@ GRAVITY = 9.81
 MIN_WEIGHT = 20
 MAX_WEIGHT = 500                    
 MIN_BOX_VOLUME = 0.125
+SWEEP_CHUNK_SIZE = 4096
+SWEEP_PARAMETERS = ('radius', 'height_cone', 'height_cyl', 'velocity_e', 'velocity_i', 'time', 'tax')
+SWEEP_FIELDS = SWEEP_PARAMETERS + ('volume', 'area', 'mass', 'fuel', 'cost')
+TRUE_WORDS = ('1', 'true', 'yes', 'y')
+FALSE_WORDS = ('0', 'false', 'no', 'n')
+GOLDEN_RATIO = (5 ** 0.5 - 1) / 2
+OPTIMIZE_GRID_POINTS = 64
+OPTIMIZE_TOLERANCE = 1e-4
+RADIUS_BOUNDS = (0.1, 100.0)
+HEIGHT_BOUNDS = (0.1, 1000.0)
+PACK_DP_BUCKETS = 1000
+PACK_DP_CELLS = 1000000
+BATCH_TIE_ULPS = 16
  
+import argparse
+import csv
+import heapq
+import itertools
 import math
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 def feet_to_meter(length):
     """
@@ -28,6 +54,122 @@ def feet_to_meter(length):
     feet_to_meter_rounded = round(feet_to_meter,2)
     return feet_to_meter_rounded
 
+class RocketDesign:
+    """
+    Holds the dimensions of a rocket and works out its volume, surface area, mass and
+    storage box the first time each is needed, then keeps them, so computing the fuel
+    and cost of a design never repeats the same geometry
+    Instance Attributes:
+        radius (float)
+        height_cone (float)
+        height_cyl (float)
+    The dimensions should not be changed once the design is created
+    """
+    __slots__ = ('radius', 'height_cone', 'height_cyl', '_volume', '_area', '_mass', '_storage')
+
+    def __init__(self, radius, height_cone, height_cyl):
+        """
+        Creates a rocket design
+        Parameters:
+            radius (float) input
+            height_cone (float) input
+            height_cyl (float) input
+        Examples:
+            >>> design = RocketDesign(2.0,7.0,3.0)
+            >>> print(design.volume, design.mass)
+            67.02 82.1
+        """
+        self.radius = radius
+        self.height_cone = height_cone
+        self.height_cyl = height_cyl
+        self._volume = None
+        self._area = None
+        self._mass = None
+        self._storage = None
+
+    @property
+    def volume(self):
+        """
+        Volume of the rocket rounded to 2 decimal places
+        """
+        if self._volume is None:
+            radius = self.radius
+            volume_of_cone = (math.pi * radius*radius) * self.height_cone/3
+            volume_of_cyl = math.pi * radius*radius * self.height_cyl
+            self._volume = round(volume_of_cone + volume_of_cyl,2)
+        return self._volume
+
+    @property
+    def area(self):
+        """
+        Surface area of the rocket rounded to 2 decimal places
+        """
+        if self._area is None:
+            radius = self.radius
+            Area_cone = math.pi * radius \
+                        *(radius + math.sqrt(self.height_cone * self.height_cone + radius * radius))
+            Area_cyl = 2 * math.pi * radius * (self.height_cyl + radius)
+            Area_circle = math.pi * radius *radius
+            self._area = round(Area_cone + Area_cyl - 2* Area_circle,2)
+        return self._area
+
+    @property
+    def mass(self):
+        """
+        Mass of the rocket, its volume times its density, rounded to 2 decimal places
+        """
+        if self._mass is None:
+            self._mass = round(self.volume * DENSITY,2)
+        return self._mass
+
+    @property
+    def storage_space(self):
+        """
+        Dimensions (width, length, height) of the rectangular storage box
+        """
+        if self._storage is None:
+            self._storage = compute_storage_space(self.radius,self.height_cyl)
+        return self._storage
+
+    def fuel(self, velocity_e, velocity_i, time):
+        """
+        Calculates the total amount of fuel required by the rocket, like rocket_fuel
+        Parameters:
+            velocity_e (float) input exhaust velocity
+            velocity_i (float) input initial velocity
+            time (float) input
+        Returns:
+            total_fuel_needed(float) rounded to 2 decimal places
+        """
+        mass = self.mass
+        mass_of_fuel = mass * ((math.exp(velocity_i/velocity_e) - 1))
+        # if statement to determine the amount of fuel needed in different conditions
+        if mass < 100000:
+            fuel_burnt = 1360
+        elif mass < 400000:
+            fuel_burnt = 2000
+        else:
+            fuel_burnt = 2721
+        return round((mass_of_fuel + (fuel_burnt * time)),2)
+
+    def cost(self, velocity_e, velocity_i, time, tax):
+        """
+        Calculates approximate cost of building and launching the rocket, like calculate_cost
+        Parameters:
+            velocity_e (float) input exhaust velocity
+            velocity_i (float) input initial velocity
+            time (float) input
+            tax (boolean) input
+        Returns:
+            total_cost (float) in dollars rounded to 2 decimal points
+        """
+        cost_of_fuel = self.fuel(velocity_e,velocity_i,time) * FUEL_COST
+        cost_of_materials = self.area * AREA_COST
+        total_cost = cost_of_materials + cost_of_fuel
+        if tax == True:
+            total_cost = (TAX * total_cost)
+        return round(total_cost,2)
+
 def rocket_volume(radius,height_cone,height_cyl):
     """
     Calculates volume of rocket
@@ -45,10 +187,7 @@ def rocket_volume(radius,height_cone,height_cyl):
         >>>print(rocket_volume(7.9,15.4,9.0))
         2771.08   
     """
-    volume_of_cone = (math.pi * radius*radius) * height_cone/3
-    volume_of_cyl = math.pi * radius*radius * height_cyl
-    rocket_volume = volume_of_cone + volume_of_cyl
-    return round(rocket_volume,2)
+    return RocketDesign(radius,height_cone,height_cyl).volume
 
 def rocket_area(radius,height_cone,height_cyl):
     """
@@ -67,12 +206,7 @@ def rocket_area(radius,height_cone,height_cyl):
         >>>print(rocket_area(14.6,9.24,5.5))
         1966.71
     """
-    Area_cone = math.pi * radius \
-                *(radius + math.sqrt(height_cone * height_cone + radius * radius))
-    Area_cyl = 2 * math.pi * radius * (height_cyl + radius)
-    Area_circle = math.pi * radius *radius
-    rocket_sa = Area_cone + Area_cyl - 2* Area_circle
-    return round(rocket_sa,2)
+    return RocketDesign(radius,height_cone,height_cyl).area
 
 
 def rocket_mass(radius,height_cone,height_cyl):
@@ -92,8 +226,7 @@ def rocket_mass(radius,height_cone,height_cyl):
         >>>print(rocket_mass(10.5,7.43,5.89))
         3549.9
     """
-    rocket_mass = (rocket_volume(radius,height_cone,height_cyl) * DENSITY)
-    return round(rocket_mass,2)
+    return RocketDesign(radius,height_cone,height_cyl).mass
 
 
 def rocket_fuel(radius,height_cone,height_cyl,velocity_e,velocity_i,time):
@@ -116,17 +249,7 @@ def rocket_fuel(radius,height_cone,height_cyl,velocity_e,velocity_i,time):
         >>>print(rocket_fuel(40,70.0,60.0,500,70.0,90.0))
         321999.51
     """
-    mass_of_fuel = rocket_mass(radius,height_cone,height_cyl) \
-                   * ((math.exp(velocity_i/velocity_e) - 1))
-    # if statement to determine the amount of fuel needed in different conditions
-    if rocket_mass(radius,height_cone,height_cyl) < 100000:
-        fuel_burnt = 1360
-    elif rocket_mass(radius,height_cone,height_cyl) < 400000:
-        fuel_burnt = 2000
-    else:
-        fuel_burnt = 2721
-    total_fuel_needed = round((mass_of_fuel + (fuel_burnt * time)),2)
-    return total_fuel_needed
+    return RocketDesign(radius,height_cone,height_cyl).fuel(velocity_e,velocity_i,time)
 
 def calculate_cost(radius, height_cone, height_cyl,velocity_e, velocity_i, time, tax):
     """
@@ -149,14 +272,186 @@ def calculate_cost(radius, height_cone, height_cyl,velocity_e, velocity_i, time,
         >>>print(calculate_cost(186.4, 51.8, 125.7, 78.45, 95.36, 92.59,True))
         322006974.25
     """
-    cost_of_fuel = rocket_fuel(radius,height_cone,height_cyl,velocity_e,velocity_i,time) * FUEL_COST
-    cost_of_materials = rocket_area(radius,height_cone,height_cyl) * AREA_COST
-    if tax == True:
-        total_cost = (cost_of_materials + cost_of_fuel)
-        total_cost = (TAX * total_cost) 
-    else:
-        total_cost = cost_of_materials + cost_of_fuel
-    return round(total_cost,2)
+    return RocketDesign(radius,height_cone,height_cyl).cost(velocity_e,velocity_i,time,tax)
+
+def _as_columns(*args):
+    """
+    Turns the arguments of a batch function into equally long lists when NumPy
+    is not installed, repeating scalar arguments as needed
+    """
+    length = max((len(arg) for arg in args if not isinstance(arg, (int, float, bool))), default=1)
+    return [[arg] * length if isinstance(arg, (int, float, bool)) else list(arg) for arg in args]
+
+
+def _run_batch(scalar, columns, *args):
+    """
+    Works out a batch function row by row with its scalar version when NumPy is not
+    installed. With NumPy, columns works out every row at once and flags the rows it
+    cannot be sure to work out exactly as the scalar version does; only those rows are
+    worked out again with the scalar version, so the results are exactly the scalar ones
+    Parameters:
+        scalar (function) input scalar version, such as rocket_volume
+        columns (function) input vectorized version, taking the arguments as arrays and the flags
+        args input arguments of the batch function
+    Returns:
+        results (list) of floats, one per row
+    """
+    if np is None:
+        return [scalar(*row) for row in zip(*_as_columns(*args))]
+    args = np.broadcast_arrays(*(np.atleast_1d(arg) for arg in args))
+    suspect = np.zeros(args[0].shape, dtype=bool)
+    with np.errstate(all='ignore'):
+        results = columns(*args, suspect)
+    for index in np.flatnonzero(suspect):
+        results[index] = scalar(*(arg[index].item() for arg in args))
+    return results.tolist()
+
+
+def _round_columns(values, suspect, slack=None):
+    """
+    Rounds an array to 2 decimal places the way round does. np.round rounds most values,
+    but those within BATCH_TIE_ULPS units in the last place of halfway between two cents,
+    where it may round the other way, are rounded one by one with round. Values that are
+    not finite, or within slack more cents of halfway because they may differ from what
+    the scalar version works out, are flagged in suspect instead
+    """
+    scaled = np.abs(values * 100)
+    distance = np.abs(scaled - np.floor(scaled) - 0.5)
+    near = distance <= BATCH_TIE_ULPS * np.spacing(scaled)
+    if slack is not None:
+        suspect |= distance <= BATCH_TIE_ULPS * np.spacing(scaled) + slack
+    suspect |= ~np.isfinite(values)
+    rounded = np.round(values, 2)
+    for index in np.flatnonzero(near & ~suspect):
+        rounded[index] = round(values[index].item(), 2)
+    return rounded
+
+
+def _volume_columns(radius, height_cone, height_cyl, suspect):
+    base = math.pi * radius * radius
+    return _round_columns(base * height_cone / 3 + base * height_cyl, suspect)
+
+
+def _area_columns(radius, height_cone, height_cyl, suspect):
+    area_cone = math.pi * radius * (radius + np.sqrt(height_cone * height_cone + radius * radius))
+    area_cyl = 2 * math.pi * radius * (height_cyl + radius)
+    return _round_columns(area_cone + area_cyl - 2 * (math.pi * radius * radius), suspect)
+
+
+def _mass_columns(radius, height_cone, height_cyl, suspect):
+    return _round_columns(_volume_columns(radius, height_cone, height_cyl, suspect) * DENSITY, suspect)
+
+
+def _fuel_columns(radius, height_cone, height_cyl, velocity_e, velocity_i, time, suspect):
+    mass = _mass_columns(radius, height_cone, height_cyl, suspect)
+    growth = np.exp(velocity_i / velocity_e)
+    fuel_burnt = np.select([mass < 100000, mass < 400000], [1360, 2000], 2721)
+    # np.exp may be a few units in the last place away from math.exp, which moves
+    # mass_of_fuel by up to mass times as much
+    slack = 100 * BATCH_TIE_ULPS * np.spacing(growth) * np.abs(mass)
+    return _round_columns(mass * (growth - 1) + fuel_burnt * time, suspect, slack)
+
+
+def _cost_columns(radius, height_cone, height_cyl, velocity_e, velocity_i, time, tax, suspect):
+    cost_of_fuel = _fuel_columns(radius, height_cone, height_cyl, velocity_e, velocity_i, time, suspect) * FUEL_COST
+    cost_of_materials = _area_columns(radius, height_cone, height_cyl, suspect) * AREA_COST
+    total_cost = cost_of_materials + cost_of_fuel
+    return _round_columns(np.where(tax == True, TAX * total_cost, total_cost), suspect)
+
+
+def rocket_volume_batch(radius, height_cone, height_cyl):
+    """
+    Calculates the volume of many rockets at once, giving exactly what rocket_volume
+    gives for each of them
+    Parameters:
+        radius (list or float) input
+        height_cone (list or float) input
+        height_cyl (list or float) input
+    Returns:
+        volumes (list) of floats rounded to 2 decimal places
+    Examples:
+        >>> print(rocket_volume_batch([2.0, 12.6], [7.0, 9.5], [3.0, 4.0]))
+        [67.02, 3574.44]
+    """
+    return _run_batch(rocket_volume, _volume_columns, radius, height_cone, height_cyl)
+
+
+def rocket_area_batch(radius, height_cone, height_cyl):
+    """
+    Calculates the surface area of many rockets at once, giving exactly what rocket_area
+    gives for each of them
+    Parameters:
+        radius (list or float) input
+        height_cone (list or float) input
+        height_cyl (list or float) input
+    Returns:
+        areas (list) of floats rounded to 2 decimal places
+    Examples:
+        >>> print(rocket_area_batch([13.4, 4.7], [17.6, 12.9], [3.9, 6.78]))
+        [1823.68, 472.34]
+    """
+    return _run_batch(rocket_area, _area_columns, radius, height_cone, height_cyl)
+
+
+def rocket_mass_batch(radius, height_cone, height_cyl):
+    """
+    Calculates the mass of many rockets at once, giving exactly what rocket_mass
+    gives for each of them
+    Parameters:
+        radius (list or float) input
+        height_cone (list or float) input
+        height_cyl (list or float) input
+    Returns:
+        masses (list) of floats rounded to 2 decimal places
+    Examples:
+        >>> print(rocket_mass_batch([2.0, 6.0], [7.0, 8.3], [3.0, 2.0]))
+        [82.1, 660.4]
+    """
+    return _run_batch(rocket_mass, _mass_columns, radius, height_cone, height_cyl)
+
+
+def rocket_fuel_batch(radius, height_cone, height_cyl, velocity_e, velocity_i, time):
+    """
+    Calculates the fuel needed by many rockets at once, giving exactly what rocket_fuel
+    gives for each of them; with NumPy the fuel burnt per second of every rocket is
+    chosen from its mass in one vectorized select
+    Parameters:
+        radius (list or float) input
+        height_cone (list or float) input
+        height_cyl (list or float) input
+        velocity_e (list or float) input exhaust velocity
+        velocity_i (list or float) input initial velocity
+        time (list or float) input
+    Returns:
+        total_fuel_needed (list) of floats rounded to 2 decimal places
+    Examples:
+        >>> print(rocket_fuel_batch([50.0, 40.0], [100.0, 70.0], [800.0, 60.0], [700.0, 500.0], [300.0, 70.0], [120.0, 90.0]))
+        [4616444.53, 321999.51]
+    """
+    return _run_batch(rocket_fuel, _fuel_columns,
+                      radius, height_cone, height_cyl, velocity_e, velocity_i, time)
+
+
+def calculate_cost_batch(radius, height_cone, height_cyl, velocity_e, velocity_i, time, tax):
+    """
+    Calculates the approximate cost of many rockets at once, giving exactly what
+    calculate_cost gives for each of them
+    Parameters:
+        radius (list or float) input
+        height_cone (list or float) input
+        height_cyl (list or float) input
+        velocity_e (list or float) input exhaust velocity
+        velocity_i (list or float) input initial velocity
+        time (list or float) input
+        tax (list or boolean) input
+    Returns:
+        total_cost (list) of floats in dollars rounded to 2 decimal points
+    Examples:
+        >>> print(calculate_cost_batch([11.2, 17.4], [51.8, 22.8], [105.7, 135.7], [123.45, 47.45], [99.65, 72.95], [81.94, 41.94], [True, False]))
+        [1354550.56, 4318522.61]
+    """
+    return _run_batch(calculate_cost, _cost_columns,
+                      radius, height_cone, height_cyl, velocity_e, velocity_i, time, tax)
 
 def compute_storage_space(radius,height_cyl):
     """
@@ -182,6 +477,29 @@ def compute_storage_space(radius,height_cyl):
     height_rocket = height_cyl/2
     return (width_rocket,length_rocket, height_rocket)
 
+def loading_limits(initial_weight, radius, height_cyl):
+    """
+    Calculates how much weight and volume of items the rocket can carry: 5% of its initial
+    weight and 40% of its storage volume
+    Parameters:
+        initial_weight (float) input
+        radius (float) input
+        height_cyl (float) input
+    Returns:
+        (max_weight, max_volume) (tuple), or None if not even the lightest smallest item fits
+    Examples:
+        >>> print(loading_limits(10000, 60, 300))
+        (500.0, 431971.3499999999)
+        >>> print(loading_limits(399.0, 100.0, 1000.0))
+        None
+    """
+    length_rocket, width_rocket, height_rocket = compute_storage_space(radius,height_cyl)
+    storage_volume = length_rocket * width_rocket * height_rocket
+    if ((MIN_BOX_VOLUME > 0.4 * storage_volume) or \
+           (MIN_WEIGHT > 0.05 * initial_weight)):
+        return None
+    return (0.05 * initial_weight, 0.4 * storage_volume)
+
 def load_rocket(initial_weight, radius, height_cyl):
     """
     Computes the volume of storage space, determines the constrains, \
@@ -212,13 +530,12 @@ def load_rocket(initial_weight, radius, height_cyl):
 
     
     """
-    length_rocket, width_rocket, height_rocket = compute_storage_space(radius,height_cyl)
-    storage_volume = length_rocket * width_rocket * height_rocket
-    if ((MIN_BOX_VOLUME > 0.4 * storage_volume) or \
-           (MIN_WEIGHT > 0.05 * initial_weight)):
+    limits = loading_limits(initial_weight, radius, height_cyl)
+    if limits is None:
         print("No more items can be added")
         return initial_weight
     else:
+        max_weight, max_volume = limits
         updated_weight = float(initial_weight)
         total_weight_added = 0
         total_volume_added = 0
@@ -237,13 +554,13 @@ def load_rocket(initial_weight, radius, height_cyl):
             total_volume_added = total_volume_added + item_volume
             
             #determining the constraints
-            first_weight_condition = total_weight_added <= 0.05 * initial_weight
+            first_weight_condition = total_weight_added <= max_weight
             second_weight_condition = MIN_WEIGHT <= item_weight <= MAX_WEIGHT
-            first_volume_condition = total_volume_added <= 0.4 * storage_volume
+            first_volume_condition = total_volume_added <= max_volume
             second_volume_condition = MIN_BOX_VOLUME <= item_volume
             
-            end_weight_condition = total_weight_added > 0.05 * initial_weight - 20
-            end_volume_condition = total_volume_added > 0.40 * storage_volume - MIN_BOX_VOLUME
+            end_weight_condition = total_weight_added > max_weight - 20
+            end_volume_condition = total_volume_added > max_volume - MIN_BOX_VOLUME
             
             if not(second_weight_condition) or not(second_volume_condition) or \
                    not (first_weight_condition) or not(first_volume_condition):
@@ -261,6 +578,128 @@ def load_rocket(initial_weight, radius, height_cyl):
         else:
             return round(updated_weight,2)
              
+def _greedy_pack(items, order, max_weight, max_volume):
+    # Takes the items in the given order, skipping any that no longer fit
+    chosen = []
+    total_weight = 0
+    total_volume = 0
+    for index in order:
+        item_weight, item_volume = items[index]
+        if total_weight + item_weight <= max_weight and total_volume + item_volume <= max_volume:
+            chosen.append(index)
+            total_weight += item_weight
+            total_volume += item_volume
+    return chosen, total_weight, total_volume
+
+def _dp_pack(items, eligible, max_weight, max_volume, buckets):
+    # 0/1 knapsack over the weight limit split into buckets, keeping the smallest volume
+    # for each weight. Weights are rounded up to whole buckets so every load found fits
+    unit = max_weight / buckets
+    volumes = [math.inf] * (buckets + 1)
+    volumes[0] = 0
+    sizes = []
+    taken = []
+    for index in eligible:
+        item_weight, item_volume = items[index]
+        size = math.ceil(item_weight / unit)
+        row = bytearray(buckets + 1)
+        for bucket in range(buckets, size - 1, -1):
+            volume = volumes[bucket - size] + item_volume
+            if volume < volumes[bucket]:
+                volumes[bucket] = volume
+                row[bucket] = 1
+        sizes.append(size)
+        taken.append(row)
+    bucket = max(bucket for bucket in range(buckets + 1) if volumes[bucket] <= max_volume)
+    chosen = []
+    for position in range(len(eligible) - 1, -1, -1):
+        if taken[position][bucket]:
+            chosen.append(eligible[position])
+            bucket -= sizes[position]
+    total_weight = sum(items[index][0] for index in chosen)
+    total_volume = sum(items[index][1] for index in chosen)
+    if total_weight > max_weight or total_volume > max_volume:
+        return [], 0, 0
+    return chosen, total_weight, total_volume
+
+def pack_rocket(initial_weight, radius, height_cyl, manifest):
+    """
+    Chooses which items of a manifest to load without asking for them one at a time,
+    under the same rules as load_rocket: every item weighs between MIN_WEIGHT and
+    MAX_WEIGHT and takes at least MIN_BOX_VOLUME, and all together weigh at most 5% of
+    the initial weight and take at most 40% of the storage volume.
+    It tries to load as much weight as possible. The items are packed greedily twice, once
+    by weight for the room they take out of both limits and once heaviest first, which
+    takes O(n log n) for n items. Small manifests are also packed exactly by dynamic
+    programming over the weight limit split into at most PACK_DP_BUCKETS steps, and the
+    heaviest of the loads is kept
+    Parameters:
+        initial_weight (float) input
+        radius (float) input
+        height_cyl (float) input
+        manifest (iterable) of (weight, width, length, height) tuples, one per item
+    Returns:
+        (chosen, final_weight, weight_utilization, volume_utilization) (tuple):
+        the indices of the items loaded in manifest order, the weight of the rocket with
+        them rounded to 2 decimal places, and the fractions of the weight and volume
+        limits they use
+    Examples:
+        >>> print(pack_rocket(10000, 60, 300, [(300, 1, 1, 1), (250, 1, 1, 1), (250, 2, 2, 2), (10, 1, 1, 1)]))
+        ([1, 2], 10500.0, 1.0, 2.0834715080062604e-05)
+        >>> print(pack_rocket(399.0, 100.0, 1000.0, [(20, 1, 1, 1)]))
+        ([], 399.0, 0.0, 0.0)
+    """
+    limits = loading_limits(initial_weight, radius, height_cyl)
+    items = []
+    eligible = []
+    for index, (item_weight, item_width, item_length, item_height) in enumerate(manifest):
+        item_volume = item_width * item_length * item_height
+        items.append((item_weight, item_volume))
+        if MIN_WEIGHT <= item_weight <= MAX_WEIGHT and MIN_BOX_VOLUME <= item_volume:
+            eligible.append(index)
+    if limits is None or not eligible:
+        return [], round(float(initial_weight),2), 0.0, 0.0
+    max_weight, max_volume = limits
+
+    def density(index):
+        item_weight, item_volume = items[index]
+        return item_weight / (item_weight / max_weight + item_volume / max_volume)
+
+    packings = [_greedy_pack(items, sorted(eligible, key=density, reverse=True), max_weight, max_volume),
+                _greedy_pack(items, sorted(eligible, key=lambda index: items[index][0], reverse=True),
+                             max_weight, max_volume)]
+    buckets = min(PACK_DP_BUCKETS, int(max_weight))
+    if len(eligible) * buckets <= PACK_DP_CELLS:
+        packings.append(_dp_pack(items, eligible, max_weight, max_volume, buckets))
+    chosen, total_weight, total_volume = max(packings, key=lambda packing: packing[1])
+    chosen.sort()
+    return (chosen, round(float(initial_weight) + total_weight,2),
+            total_weight / max_weight, total_volume / max_volume)
+
+def read_manifest(file_name):
+    """
+    Reads a manifest of items from a CSV file with the columns weight, width, length
+    and height, in that order, and an optional header row
+    Parameters:
+        file_name (str) input
+    Returns:
+        manifest (generator) of (weight, width, length, height) tuples
+    Examples:
+        >>> print(list(read_manifest("manifest.csv")))
+        [(120.0, 6.0, 4.0, 5.0), (35.5, 1.0, 2.0, 0.5)]
+    """
+    with open(file_name, 'r', newline='') as manifest_file:
+        for line_number, row in enumerate(csv.reader(manifest_file)):
+            if not row:
+                continue
+            try:
+                item_weight, item_width, item_length, item_height = map(float, row)
+            except ValueError:
+                if line_number == 0:
+                    continue
+                raise
+            yield item_weight, item_width, item_length, item_height
+
 def projectile_sim(simulation_time, interval, velocity_i, angle):
     '''
     Prints the height of rocket at each time interval
@@ -297,6 +736,317 @@ def projectile_sim(simulation_time, interval, velocity_i, angle):
         if height >= 0:
             print(round(height,2))
                
+def parse_values(text, cast=float):
+    """
+    Reads the values of one sweep parameter from text, either a comma separated list
+    of values or start:stop:count for count evenly spaced values from start to stop
+    Parameters:
+        text (str) input
+        cast (function) converts each value, float by default, or parse_bool for tax
+    Returns:
+        values (list)
+    Examples:
+        >>> print(parse_values("1:2:5"))
+        [1.0, 1.25, 1.5, 1.75, 2.0]
+        >>> print(parse_values("800,900"))
+        [800.0, 900.0]
+        >>> print(parse_values("yes,no", parse_bool))
+        [True, False]
+    """
+    if ':' in text:
+        start, stop, count = text.split(':')
+        start, stop, count = float(start), float(stop), int(count)
+        if count < 1:
+            raise ValueError("A range needs at least one value!")
+        if count == 1:
+            return [start]
+        step = (stop - start) / (count - 1)
+        return [start + step * i for i in range(count - 1)] + [stop]
+    return [cast(value.strip()) for value in text.split(',')]
+
+def parse_bool(text):
+    """
+    Reads a yes or no answer, such as whether to factor in tax
+    Parameters:
+        text (str) input
+    Returns:
+        answer (boolean)
+    Examples:
+        >>> print(parse_bool("1"), parse_bool("No"))
+        True False
+    """
+    word = text.strip().lower()
+    if word in TRUE_WORDS:
+        return True
+    if word in FALSE_WORDS:
+        return False
+    raise ValueError("Expected yes or no, got " + repr(text))
+
+def sweep_grid(radius, height_cone, height_cyl, velocity_e, velocity_i, time, tax):
+    """
+    Lists every combination of the given parameter values without building them all at once
+    Parameters:
+        radius, height_cone, height_cyl, velocity_e, velocity_i, time, tax (list)
+        the values of each parameter, in the order of SWEEP_PARAMETERS
+    Returns:
+        points (iterator) of tuples in the order of SWEEP_PARAMETERS. The last parameters
+        change fastest, so designs with the same dimensions come one after the other
+    Examples:
+        >>> print(list(sweep_grid([1.0], [2.0], [3.0], [800.0], [400.0], [10.0], [True, False])))
+        [(1.0, 2.0, 3.0, 800.0, 400.0, 10.0, True), (1.0, 2.0, 3.0, 800.0, 400.0, 10.0, False)]
+    """
+    return itertools.product(radius, height_cone, height_cyl, velocity_e, velocity_i, time, tax)
+
+def evaluate_designs(points, top_k=None):
+    """
+    Computes the volume, area, mass, fuel and cost of every design in a chunk of the grid.
+    A RocketDesign is shared by consecutive points with the same dimensions, so its
+    geometry is only worked out once for all their velocities, times and taxes
+    Parameters:
+        points (iterable) of tuples in the order of SWEEP_PARAMETERS
+        top_k (int) input, keeps only the top_k cheapest designs when given
+    Returns:
+        rows (list) of tuples in the order of SWEEP_FIELDS, cheapest first when top_k is given
+    Examples:
+        >>> print(evaluate_designs([(2.0, 7.0, 3.0, 800.0, 400.0, 10.0, False)]))
+        [(2.0, 7.0, 3.0, 800.0, 400.0, 10.0, False, 67.02, 96.01, 82.1, 13653.26, 83764.94)]
+    """
+    rows = []
+    design = None
+    for radius, height_cone, height_cyl, velocity_e, velocity_i, time, tax in points:
+        if design is None or design.radius != radius or design.height_cone != height_cone \
+               or design.height_cyl != height_cyl:
+            design = RocketDesign(radius, height_cone, height_cyl)
+        fuel = design.fuel(velocity_e, velocity_i, time)
+        cost = round((fuel * FUEL_COST + design.area * AREA_COST) * (TAX if tax == True else 1), 2)
+        rows.append((radius, height_cone, height_cyl, velocity_e, velocity_i, time, tax,
+                     design.volume, design.area, design.mass, fuel, cost))
+    if top_k is not None:
+        # The cheapest designs of the whole grid are among the cheapest of each chunk
+        rows = heapq.nsmallest(top_k, rows, key=lambda row: row[-1])
+    return rows
+
+def _evaluate_chunk(args):
+    points, top_k = args
+    return evaluate_designs(points, top_k)
+
+def sweep_designs(points, workers=None, chunk_size=SWEEP_CHUNK_SIZE, top_k=None):
+    """
+    Evaluates designs in chunks across a pool of processes and yields the results as they
+    come in. Only a few chunks are in flight at a time, so a grid of any size can be swept
+    Parameters:
+        points (iterable) of tuples in the order of SWEEP_PARAMETERS, such as sweep_grid
+        workers (int) input, number of worker processes. Defaults to the number of CPUs,
+        and 1 evaluates everything in this process
+        chunk_size (int) input, number of designs sent to a worker at a time
+        top_k (int) input, only the top_k cheapest designs are kept when given
+    Returns:
+        rows (generator) of tuples in the order of SWEEP_FIELDS, in the order of points,
+        or the top_k cheapest designs, cheapest first, once the whole grid is swept
+    Examples:
+        >>> grid = sweep_grid([2.0, 4.0], [7.0], [3.0], [800.0], [400.0], [10.0], [False])
+        >>> print([row[-1] for row in sweep_designs(grid, workers=1)])
+        [83764.94, 85394.44]
+        >>> grid = sweep_grid([2.0, 4.0], [7.0], [3.0], [800.0], [400.0], [10.0], [False])
+        >>> print([row[0] for row in sweep_designs(grid, workers=1, top_k=1)])
+        [2.0]
+    """
+    points = iter(points)
+    chunks = iter(lambda: list(itertools.islice(points, chunk_size)), [])
+    if workers == 1:
+        results = (evaluate_designs(chunk, top_k) for chunk in chunks)
+        yield from _merge_results(results, top_k)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        max_pending = 2 * (workers or os.cpu_count() or 1)
+        yield from _merge_results(_bounded_map(executor, _evaluate_chunk,
+                                               ((chunk, top_k) for chunk in chunks), max_pending),
+                                  top_k)
+
+def _bounded_map(executor, function, jobs, max_pending):
+    # Unlike executor.map, submits a new job only once an earlier one is collected
+    pending = deque()
+    for job in jobs:
+        pending.append(executor.submit(function, job))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def _merge_results(results, top_k):
+    if top_k is None:
+        for rows in results:
+            yield from rows
+        return
+    # Max heap of the cheapest designs so far, the index keeps equal costs in grid order
+    best = []
+    index = 0
+    for rows in results:
+        for row in rows:
+            entry = (-row[-1], -index, row)
+            index += 1
+            if len(best) < top_k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+    yield from (row for _, _, row in sorted(best, reverse=True))
+
+def write_csv(rows, output_file):
+    """
+    Streams sweep results to a CSV file with a header row
+    Parameters:
+        rows (iterable) of tuples in the order of SWEEP_FIELDS
+        output_file (file) an open text file
+    Returns:
+        count (int) number of designs written
+    Examples:
+        >>> import io
+        >>> output_file = io.StringIO()
+        >>> print(write_csv([(2.0, 7.0, 3.0, 800.0, 400.0, 10.0, False, 67.02, 96.01, 82.1, 13653.26, 83764.94)], output_file))
+        1
+        >>> print(output_file.getvalue().splitlines()[0])
+        radius,height_cone,height_cyl,velocity_e,velocity_i,time,tax,volume,area,mass,fuel,cost
+    """
+    writer = csv.writer(output_file)
+    writer.writerow(SWEEP_FIELDS)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+def write_columns(rows, directory, block_size=SWEEP_CHUNK_SIZE):
+    """
+    Streams sweep results in a columnar layout, one file per field named after it with
+    one value per line, so a single column can be read without the others
+    Parameters:
+        rows (iterable) of tuples in the order of SWEEP_FIELDS
+        directory (str) input, created if it does not exist
+        block_size (int) input, number of rows buffered before each write
+    Returns:
+        count (int) number of designs written
+    Examples:
+        >>> write_columns(sweep_designs(sweep_grid([2.0], [7.0], [3.0], [800.0], [400.0], [10.0], [False]), workers=1), "designs")
+        1
+        >>> print(open("designs/cost.txt").read())
+        83764.94
+        <BLANKLINE>
+    """
+    os.makedirs(directory, exist_ok=True)
+    column_files = [open(os.path.join(directory, field + '.txt'), 'w') for field in SWEEP_FIELDS]
+    count = 0
+    try:
+        rows = iter(rows)
+        while True:
+            block = list(itertools.islice(rows, block_size))
+            if not block:
+                break
+            count += len(block)
+            for column_file, column in zip(column_files, zip(*block)):
+                column_file.write('\n'.join(map(str, column)) + '\n')
+    finally:
+        for column_file in column_files:
+            column_file.close()
+    return count
+
+def storage_volume(radius, height_cyl):
+    """
+    Calculates the volume of the rectangular storage box
+    Parameters:
+        radius (float) input
+        height_cyl (float) input
+    Returns:
+        volume (float)
+    Examples:
+        >>> print(storage_volume(5.0, 10.0))
+        249.92
+    """
+    width_rocket, length_rocket, height_rocket = compute_storage_space(radius, height_cyl)
+    return round(width_rocket * length_rocket * height_rocket, 2)
+
+def _height_for_storage(radius, required_volume):
+    # Smallest cylinder height whose storage box holds the required volume
+    width_rocket = round(math.sqrt(2) * radius, 2)
+    if width_rocket <= 0:
+        return math.inf
+    height_cyl = 2 * required_volume / (width_rocket * width_rocket)
+    while width_rocket * width_rocket * (height_cyl / 2) < required_volume:
+        height_cyl = math.nextafter(height_cyl, math.inf)
+    return height_cyl
+
+def optimize_design(required_volume, fuel_budget, height_cone, velocity_e, velocity_i, time, tax,
+                    radius_bounds=RADIUS_BOUNDS, height_bounds=HEIGHT_BOUNDS,
+                    grid_points=OPTIMIZE_GRID_POINTS, tolerance=OPTIMIZE_TOLERANCE):
+    """
+    Finds the cheapest radius and cylinder height whose storage box holds the required
+    volume without needing more fuel than the budget.
+    The cost only grows with the cylinder height, so for every radius the best height is
+    the smallest one that holds the required volume, which leaves a search over the radius
+    alone. A coarse grid of radii finds the cheapest region, then a golden-section search
+    narrows it down, since the fuel brackets make the cost jump and can hide the minimum
+    from a search started anywhere else
+    Parameters:
+        required_volume (float) input, storage volume the design must hold
+        fuel_budget (float) input, most fuel the trip may need
+        height_cone (float) input
+        velocity_e (float) input exhaust velocity
+        velocity_i (float) input initial velocity
+        time (float) input
+        tax (boolean) input
+        radius_bounds (tuple) smallest and largest radius to consider
+        height_bounds (tuple) smallest and largest cylinder height to consider
+        grid_points (int) input, number of radii tried before narrowing down
+        tolerance (float) input, width of the final radius interval
+    Returns:
+        (radius, height_cyl, cost) (tuple) of the cheapest design found,
+        or None if no design within the bounds meets both constraints
+    Examples:
+        >>> radius, height_cyl, cost = optimize_design(500.0, 3000000.0, 7.0, 800.0, 400.0, 1500.0, True)
+        >>> print(storage_volume(radius, height_cyl) >= 500.0, cost)
+        True 14325197.47
+        >>> print(optimize_design(500.0, 1000.0, 7.0, 800.0, 400.0, 1500.0, True))
+        None
+    """
+    min_height, max_height = height_bounds
+
+    def design_cost(radius):
+        height_cyl = max(_height_for_storage(radius, required_volume), min_height)
+        if height_cyl > max_height:
+            return math.inf, height_cyl
+        design = RocketDesign(radius, height_cone, height_cyl)
+        if design.fuel(velocity_e, velocity_i, time) > fuel_budget:
+            return math.inf, height_cyl
+        return design.cost(velocity_e, velocity_i, time, tax), height_cyl
+
+    # Coarse grid warm start
+    low, high = radius_bounds
+    step = (high - low) / (grid_points - 1)
+    radii = [low + step * i for i in range(grid_points - 1)] + [high]
+    costs = [design_cost(radius)[0] for radius in radii]
+    best = min(range(grid_points), key=costs.__getitem__)
+    best_radius, best_cost = radii[best], costs[best]
+    if best_cost == math.inf:
+        return None
+
+    # Golden-section search between the neighbours of the best radius on the grid
+    low, high = radii[max(best - 1, 0)], radii[min(best + 1, grid_points - 1)]
+    left = high - GOLDEN_RATIO * (high - low)
+    right = low + GOLDEN_RATIO * (high - low)
+    left_cost, right_cost = design_cost(left)[0], design_cost(right)[0]
+    while high - low > tolerance:
+        if left_cost <= right_cost:
+            high, right, right_cost = right, left, left_cost
+            left = high - GOLDEN_RATIO * (high - low)
+            left_cost = design_cost(left)[0]
+        else:
+            low, left, left_cost = left, right, right_cost
+            right = low + GOLDEN_RATIO * (high - low)
+            right_cost = design_cost(right)[0]
+    for radius, cost in ((left, left_cost), (right, right_cost)):
+        if cost < best_cost:
+            best_radius, best_cost = radius, cost
+    return best_radius, design_cost(best_radius)[1], best_cost
+
 def rocket_main():
     """
     Makes use of all the functions and gets all inputs from users
@@ -357,3 +1107,93 @@ def rocket_main():
     interval = int(input("Enter the simulation interval: "))
     print("Now simulating the rocket trajectory:")
     projectile_sim(simulation_time, interval, velocity_i, angle)
+
+def main(argv=None):
+    """
+    Command line entry point. Without a command, runs the interactive simulation
+    Examples:
+    $ python "Rocket Simulation.py"
+    $ python "Rocket Simulation.py" sweep --radius 1:20:20 --height-cyl 10:100:10 --tax yes,no --output designs.csv
+    $ python "Rocket Simulation.py" sweep --radius 1:20:200 --format columns --output designs --top-k 10
+    $ python "Rocket Simulation.py" optimize --storage-volume 500 --fuel-budget 3000000
+    $ python "Rocket Simulation.py" pack manifest.csv --initial-weight 60075.27 --radius 15.24 --height-cyl 54.88
+    """
+    parser = argparse.ArgumentParser(description="Simulate rockets and explore their designs.")
+    commands = parser.add_subparsers(dest="command")
+    sweep_parser = commands.add_parser("sweep", help="evaluate every combination of design parameters",
+                                       epilog="Values are a comma separated list or start:stop:count.")
+    sweep_parser.add_argument("--radius", default="2.0", help="rocket radii in meters")
+    sweep_parser.add_argument("--height-cone", default="7.0", help="cone heights in meters")
+    sweep_parser.add_argument("--height-cyl", default="3.0", help="cylinder heights in meters")
+    sweep_parser.add_argument("--velocity-e", default="800.0", help="exhaust velocities")
+    sweep_parser.add_argument("--velocity-i", default="400.0", help="initial velocities")
+    sweep_parser.add_argument("--time", default="1500.0", help="trip lengths")
+    sweep_parser.add_argument("--tax", default="yes", help="whether to factor in tax, such as yes,no")
+    sweep_parser.add_argument("--output", default="-", help="file, or directory for columns (default: stdout)")
+    sweep_parser.add_argument("--format", choices=("csv", "columns"), default="csv", help="output layout")
+    sweep_parser.add_argument("--top-k", type=int, default=None, help="only keep the cheapest designs")
+    sweep_parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    sweep_parser.add_argument("--chunk-size", type=int, default=SWEEP_CHUNK_SIZE,
+                              help="designs sent to a worker at a time")
+    optimize_parser = commands.add_parser("optimize", help="find the cheapest radius and cylinder height")
+    optimize_parser.add_argument("--storage-volume", type=float, required=True,
+                                 help="storage volume the design must hold")
+    optimize_parser.add_argument("--fuel-budget", type=float, required=True, help="most fuel the trip may need")
+    optimize_parser.add_argument("--height-cone", type=float, default=7.0, help="cone height in meters")
+    optimize_parser.add_argument("--velocity-e", type=float, default=800.0, help="exhaust velocity")
+    optimize_parser.add_argument("--velocity-i", type=float, default=400.0, help="initial velocity")
+    optimize_parser.add_argument("--time", type=float, default=1500.0, help="trip length")
+    optimize_parser.add_argument("--tax", type=parse_bool, default=True, help="whether to factor in tax")
+    optimize_parser.add_argument("--radius-bounds", type=float, nargs=2, default=RADIUS_BOUNDS,
+                                 help="smallest and largest radius")
+    optimize_parser.add_argument("--height-bounds", type=float, nargs=2, default=HEIGHT_BOUNDS,
+                                 help="smallest and largest cylinder height")
+    pack_parser = commands.add_parser("pack", help="choose which items of a manifest to load")
+    pack_parser.add_argument("manifest", help="CSV file of items with weight, width, length and height")
+    pack_parser.add_argument("--initial-weight", type=float, required=True, help="weight of the rocket in kg")
+    pack_parser.add_argument("--radius", type=float, required=True, help="rocket radius in meters")
+    pack_parser.add_argument("--height-cyl", type=float, required=True, help="cylinder height in meters")
+    pack_parser.add_argument("--output", help="CSV file to write the chosen items to")
+    args = parser.parse_args(argv)
+
+    if args.command == "sweep":
+        grid = sweep_grid(parse_values(args.radius), parse_values(args.height_cone),
+                          parse_values(args.height_cyl), parse_values(args.velocity_e),
+                          parse_values(args.velocity_i), parse_values(args.time),
+                          parse_values(args.tax, parse_bool))
+        rows = sweep_designs(grid, args.workers, args.chunk_size, args.top_k)
+        if args.format == "columns":
+            if args.output == "-":
+                parser.error("--format columns needs an --output directory")
+            write_columns(rows, args.output)
+        elif args.output == "-":
+            write_csv(rows, sys.stdout)
+        else:
+            with open(args.output, 'w', newline='') as output_file:
+                write_csv(rows, output_file)
+    elif args.command == "optimize":
+        result = optimize_design(args.storage_volume, args.fuel_budget, args.height_cone, args.velocity_e,
+                                 args.velocity_i, args.time, args.tax, tuple(args.radius_bounds),
+                                 tuple(args.height_bounds))
+        if result is None:
+            print("No design meets the storage volume and fuel budget")
+            return 1
+        radius, height_cyl, cost = result
+        print("radius", round(radius, 4), "height_cyl", round(height_cyl, 4), "cost", cost)
+    elif args.command == "pack":
+        manifest = list(read_manifest(args.manifest))
+        chosen, final_weight, weight_utilization, volume_utilization = \
+                pack_rocket(args.initial_weight, args.radius, args.height_cyl, manifest)
+        print(len(chosen), "of", len(manifest), "items loaded, the rocket weighs", final_weight, "kg")
+        print("weight limit used", format(weight_utilization, ".2%"),
+              "volume limit used", format(volume_utilization, ".2%"))
+        if args.output is not None:
+            with open(args.output, 'w', newline='') as output_file:
+                writer = csv.writer(output_file)
+                writer.writerow(('weight', 'width', 'length', 'height'))
+                writer.writerows(manifest[index] for index in chosen)
+    else:
+        rocket_main()
+
+if __name__ == "__main__":
+    main()
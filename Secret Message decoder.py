@@ -1,3 +1,73 @@
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+#Constants
+MAX_SENTENCE_LENGTH = 1000
+MAX_SIDE = math.isqrt(MAX_SENTENCE_LENGTH)
+DEFAULT_CHUNK_SIZE = 1 << 16
+DEFAULT_SHARD_SIZE = 1 << 20
+VALID_SENTENCE = re.compile(r'[A-Za-z ]*')
+PADDING_CHAR = ' '
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8765
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_DELAY = 0.005
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+MAX_PENDING_PER_CLIENT = 1024
+DEFAULT_TOP_K = 5
+DEFAULT_MAX_CHAIN_LENGTH = 3
+DEFAULT_PRUNE_AFTER = 3
+DEFAULT_PRUNE_BELOW = 0.05
+CRACK_OPERATIONS = ('horizontal_flip', 'vertical_flip', 'transpose',
+                    'rotate_90', 'rotate_180', 'rotate_270')
+# Frequent English words used to score candidate decipherments
+COMMON_WORDS = frozenset('''
+    a about after all also an and any are as at be because been but by can come could day do
+    even first for from get give go good has have he her here him his how i if in into is it
+    its just know like look make man me more most my new no not now of on one only or other
+    our out over people say see she so some take than that the their them then there these
+    they think this time to two up us use very want was way we well what when which who will
+    with work would year you your hello bye meet secret message code attack dawn north south
+    east west send help stop yes no tonight tomorrow noon midnight agent base plan
+    '''.split())
+# Range of square sides of the sentences in each synthetic benchmark corpus
+BENCHMARK_PROFILES = {'short': (1, 5), 'uniform': (1, MAX_SIDE), 'long': (MAX_SIDE - 3, MAX_SIDE)}
+BENCHMARK_ALPHABET = 'abcdefghijklmnopqrstuvwxyz   '
+# Position before an upper case letter between two lowercase letters
+CAMEL_CASE_BOUNDARY = re.compile(r'(?<=[a-z])(?=[A-Z][a-z])')
+
+# Index of the character of an n x n sentence that lands at row i, column j of each transform
+TRANSFORMS = {
+    'horizontal_flip': lambda i, j, n: i * n + n - 1 - j,
+    'vertical_flip': lambda i, j, n: (n - 1 - i) * n + j,
+    'transpose': lambda i, j, n: j * n + i,
+    'rotate_90': lambda i, j, n: (n - 1 - j) * n + i,
+    'rotate_180': lambda i, j, n: (n - 1 - i) * n + n - 1 - j,
+    'rotate_270': lambda i, j, n: j * n + n - 1 - i,
+    # flip_list: horizontal_flip followed by transpose
+    'decipher': lambda i, j, n: j * n + n - 1 - i,
+    # Inverse of decipher
+    'encipher': lambda i, j, n: (n - 1 - j) * n + i,
+}
+
+# Operations taking an amount k, used as (name, k) in a TransformChain
+SHIFTS = {
+    'row_shift': lambda i, j, n, k: (i - k) % n * n + j,
+    'col_shift': lambda i, j, n, k: i * n + (j - k) % n,
+}
+
+# Lazily filled, maps (transform name, n) to (permutation, row slices)
+PERMUTATION_TABLE = {}
+
 def is_not_valid(a):
     '''
     Goes through all the characters in a string. If one of the characters \
@@ -14,14 +84,8 @@ def is_not_valid(a):
     >>> is_not_valid('123456')
     True
     '''
-    for char in a:
-        ascii_value = ord(char)
-        #Comparing characters with ascii values to see if conditions are met
-        if not (65<= ascii_value <=90 or 97<= ascii_value <= 122 or
-                ascii_value == 32):
-            return True
-    else:
-        return False
+    #Matching the whole string against the letters and space character class
+    return VALID_SENTENCE.fullmatch(a) is None
 
 
 def is_not_square(b):
@@ -41,12 +105,30 @@ def is_not_square(b):
         
     '''
     length = len(b)
-    i = 1
-    while length >= i * i:
-        if i * i == length:
-            return False
-        i += 1
-    return True
+    return length == 0 or math.isqrt(length) ** 2 != length
+
+
+def sentence_side(sentence):
+    '''
+    Checks everything a sentence needs to be deciphered, each fact once: it contains
+    only letters and spaces, and its length is a square number from 1 to 1000.
+    Parameters:
+        sentence(string): user input
+    Returns:
+        (int): side of the square the sentence fills, or 0 if the sentence is invalid
+    Examples:
+    >>> sentence_side('abcdefghi')
+    3
+    >>> sentence_side('abcdefgh1')
+    0
+    >>> sentence_side('check this')
+    0
+    '''
+    length = len(sentence)
+    if length == 0 or length > MAX_SENTENCE_LENGTH or VALID_SENTENCE.fullmatch(sentence) is None:
+        return 0
+    n = math.isqrt(length)
+    return n if n * n == length else 0
 
 
 def string2list(c):
@@ -65,14 +147,9 @@ def string2list(c):
     [['h', 'e', 'l'], ['l', 'o', ' '], ['b', 'y', 'e']] 
     '''
     #Checking string validity
-    if is_not_valid(c) or is_not_square(c) or not 1<= len(c) <= 1000:
+    n = sentence_side(c)
+    if not n:
         return []
-    n = 1
-    while n * n < len(c):
-        n+=1
-
-    if n * n != len(c):
-        return[]
     #Creating 2d list
     result = []
     for i in range(0,len(c),n):
@@ -97,17 +174,48 @@ def add_space(input_text):
     'A'
     >>> add_space('thisISaTest')
     'thisISa Test'
+    >>> add_space('déjàVuÉté')
+    'déjà Vu Été'
     '''
-    result = []
-    for i in range(len(input_text)):
+    if input_text.isascii():
+        return CAMEL_CASE_BOUNDARY.sub(' ', input_text)
+
+    # str.isupper and str.islower also know letters outside ASCII, which the pattern does not
+    result = [input_text[:1]]
+    for previous, char, following in zip(input_text, input_text[1:], input_text[2:]):
         #Checking if an uppercase letter is between two lowercase letters, add space if true
-        if (i > 0 and i < len(input_text) -1 and input_text[i].isupper()
-            and input_text[i - 1].islower() and input_text[i + 1].islower()):
+        if char.isupper() and previous.islower() and following.islower():
             result.append(' ')
-            
-        result.append(input_text[i])
-        output_text = ''.join(result)
-    return output_text
+        result.append(char)
+    if len(input_text) > 1:
+        result.append(input_text[-1])
+    return ''.join(result)
+
+
+def add_space_stream(chunks):
+    '''
+    Applies add_space to text arriving in pieces, giving the same result as add_space
+    on the whole text. The last character of each piece is held back until the next
+    piece shows what follows it.
+    Parameters:
+        chunks(iterable): pieces of text
+    Returns:
+        (generator): yields the spaced text piece by piece
+    Examples:
+    >>> ''.join(add_space_stream(['howA', 'reY', 'ou']))
+    'how Are You'
+    '''
+    previous = ''
+    held = ''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        text = previous + held + chunk
+        # No space can go before the first or the last character of text
+        yield add_space(text)[len(previous):-1]
+        previous = text[-2] if len(text) > 1 else ''
+        held = text[-1]
+    yield held
 
 
 def list2string(list):
@@ -126,12 +234,8 @@ def list2string(list):
     >>> list2string([['T', 'e', 's'], ['t', 'I', 'n'], ['g', ' ', '1']])
     'Test Ing 1'
     '''
-    # converting list into string
-    result = ""
-    for row in list:
-        # joining row characters and adding them to result
-        result += ''.join(row)
-    return add_space(result)
+    # joining row characters and converting list into string in one allocation
+    return add_space(''.join([''.join(row) for row in list]))
 
 
 def horizontal_flip(input_list):
@@ -216,6 +320,315 @@ def flip_list(input_list):
     transpose(input_list)
     
 
+def _row_slices(permutation, n):
+    # Expresses every output row as one slice of the input when its indices are evenly spaced
+    row_slices = []
+    for start in range(0, n * n, n):
+        row = permutation[start:start + n]
+        step = row[1] - row[0] if n > 1 else 1
+        if step == 0 or any(row[k] != row[0] + k * step for k in range(n)):
+            return None
+        stop = row[0] + n * step
+        row_slices.append(slice(row[0], stop if stop >= 0 else None, step))
+    return tuple(row_slices)
+
+
+def _operation_permutation(operation, n):
+    if isinstance(operation, str):
+        return _table_entry(operation, n)[0]
+    name, k = operation
+    index = SHIFTS[name]
+    return tuple(index(i, j, n, k) for i in range(n) for j in range(n))
+
+
+def _table_entry(name, n):
+    entry = PERMUTATION_TABLE.get((name, n))
+    if entry is None:
+        index = TRANSFORMS[name]
+        permutation = tuple(index(i, j, n) for i in range(n) for j in range(n))
+        entry = (permutation, _row_slices(permutation, n))
+        PERMUTATION_TABLE[(name, n)] = entry
+    return entry
+
+
+def _chain_entry(operations, n):
+    # Fusing a chain: applying an operation after the chain so far reads
+    # position p of the current result, which is position permutation[p] of the input
+    permutation = tuple(range(n * n))
+    for operation in operations:
+        permutation = tuple(map(permutation.__getitem__, _operation_permutation(operation, n)))
+    return (permutation, _row_slices(permutation, n))
+
+
+def get_permutation(name, n):
+    '''
+    Looks up the permutation a transform applies to an n x n sentence, computing it
+    the first time it is needed.
+    Parameters:
+        name (str): One of the keys of TRANSFORMS.
+        n (int): Side of the square.
+    Returns:
+        (tuple): Position in the sentence of each character of the result.
+    Examples:
+    >>> get_permutation('decipher', 2)
+    (1, 3, 0, 2)
+    >>> get_permutation('transpose', 3)
+    (0, 3, 6, 1, 4, 7, 2, 5, 8)
+    '''
+    return _table_entry(name, n)[0]
+
+
+def fill_permutation_table():
+    '''
+    Computes the table of every transform for every valid side length up front,
+    for example before forking worker processes.
+    Returns:
+        None(NoneType)
+    '''
+    for name in TRANSFORMS:
+        for n in range(1, MAX_SIDE + 1):
+            _table_entry(name, n)
+
+
+def _transform(sentence, name, n):
+    return _apply_entry(sentence, _table_entry(name, n))
+
+
+def _apply_entry(sentence, entry):
+    permutation, row_slices = entry
+    if row_slices is not None:
+        return ''.join([sentence[row_slice] for row_slice in row_slices])
+    return ''.join(map(sentence.__getitem__, permutation))
+
+
+def apply_transform(sentence, name):
+    '''
+    Applies a transform to a sentence whose length is a square number, without building
+    any 2D list.
+    Parameters:
+        sentence (str): The sentence to transform.
+        name (str): One of the keys of TRANSFORMS.
+    Returns:
+        (string): The transformed sentence.
+    Raises:
+        ValueError: If the length of the sentence is not a square number.
+    Examples:
+    >>> apply_transform('BlHyoee l', 'decipher')
+    'Hello Bye'
+    >>> apply_transform('Hello Bye', 'encipher')
+    'BlHyoee l'
+    >>> apply_transform('abcdefghi', 'horizontal_flip')
+    'cbafedihg'
+    '''
+    if is_not_square(sentence):
+        raise ValueError("Sentence length should be a square number!")
+    return _transform(sentence, name, math.isqrt(len(sentence)))
+
+
+class TransformChain:
+    '''
+    A sequence of grid operations compiled into a single permutation for each sentence size,
+    so the whole chain runs over a sentence in one pass without building any grid.
+    Operations are the names in TRANSFORMS, such as 'horizontal_flip' or 'rotate_90',
+    and ('row_shift', k) or ('col_shift', k) to move rows down or columns right by k.
+    Instance Attributes:
+        operations (tuple): The operations, applied first to last.
+    Fused permutations are kept on the chain rather than in PERMUTATION_TABLE, so they are
+    freed with the chain instead of piling up for every chain ever tried.
+    '''
+
+    def __init__(self, operations):
+        '''
+        Creates a chain of operations.
+        Parameters:
+            operations (iterable): Operation names and (name, k) shift pairs.
+        Returns:
+            None(NoneType)
+        Raises:
+            ValueError: If an operation is unknown.
+        Examples:
+        >>> TransformChain(['horizontal_flip', 'transpose']).apply('BlHyoee l')
+        'Hello Bye'
+        >>> TransformChain([('row_shift', 1)]).apply('abcdefghi')
+        'ghiabcdef'
+        '''
+        checked = []
+        for operation in operations:
+            if isinstance(operation, str):
+                if operation not in TRANSFORMS:
+                    raise ValueError("Unknown grid operation: " + operation)
+            else:
+                name, k = operation
+                if name not in SHIFTS:
+                    raise ValueError("Unknown grid operation: " + str(name))
+                operation = (name, int(k))
+            checked.append(operation)
+        self.operations = tuple(checked)
+        # Maps n to the (permutation, row slices) of the chain for that size
+        self._entries = {}
+
+
+    def __repr__(self):
+        return 'TransformChain(' + repr(list(self.operations)) + ')'
+
+
+    def permutation(self, n):
+        '''
+        Returns the fused permutation of the chain for an n x n sentence, computed once per size.
+        Examples:
+        >>> TransformChain(['rotate_90', 'rotate_270']).permutation(2)
+        (0, 1, 2, 3)
+        '''
+        return self._entry(n)[0]
+
+
+    def _entry(self, n):
+        entry = self._entries.get(n)
+        if entry is None:
+            entry = self._entries[n] = _chain_entry(self.operations, n)
+        return entry
+
+
+    def apply(self, sentence):
+        '''
+        Applies the chain to a sentence whose length is a square number.
+        Raises:
+            ValueError: If the length of the sentence is not a square number.
+        '''
+        if is_not_square(sentence):
+            raise ValueError("Sentence length should be a square number!")
+        return _apply_entry(sentence, self._entry(math.isqrt(len(sentence))))
+
+
+    def decipher_sentence(self, sentence):
+        '''
+        Deciphers a single sentence with the chain as the key, like decipher_sentence.
+        Returns:
+            (string): The deciphered sentence, or None if the sentence is invalid.
+        '''
+        n = sentence_side(sentence)
+        if not n:
+            return None
+        return add_space(_apply_entry(sentence, self._entry(n)))
+
+
+    def decipher_code(self, input_string):
+        '''
+        Deciphers the input string with the chain as the key, like decipher_code.
+        Examples:
+        >>> TransformChain(['horizontal_flip', 'transpose']).decipher_code('BlHyoee l.')
+        'Hello Bye.'
+        '''
+        result = '. '.join(_decipher_shard(input_string, self.decipher_sentence))
+        if input_string and input_string[-1] == '.':
+            result += '.'
+        return result
+
+
+def decipher_sentence_reference(sentence):
+    '''
+    Deciphers a single sentence by converting it to a list, flipping it using the flip_list
+    function, and converting it back to a string. Kept as the reference for decipher_sentence.
+    Parameters:
+        sentence (str): The sentence to be deciphered, without its full stop.
+    Returns:
+        (string): The deciphered sentence, or None if the sentence is invalid.
+    Examples:
+    >>> decipher_sentence_reference('BlHyoee l')
+    'Hello Bye'
+    >>> decipher_sentence_reference('Hey2') is None
+    True
+    >>> sentences = ['BlHyoee l', 'xyzAbcDef', 'abcd', 'Hey2', 'ab', '', 'ñaÉbcÜdéf']
+    >>> [decipher_sentence(sentence) == decipher_sentence_reference(sentence) for sentence in sentences]
+    [True, True, True, True, True, True, True]
+    '''
+    # Check if the sentence is valid 
+    if not is_not_valid(sentence) and sentence != '':
+        sentence_2d = string2list(sentence)
+
+        # Process the sentence only if string2list returned a valid 2D list
+        if sentence_2d:
+            flip_list(sentence_2d)
+            return list2string(sentence_2d)
+    return None
+
+
+def decipher_sentence(sentence):
+    '''
+    Deciphers a single sentence without building any 2D list, using the decipher
+    permutation of its size from the permutation table. A horizontal flip followed
+    by a transpose puts character j * n + n - 1 - i of the sentence at row i, column j,
+    so row i of the result is the slice sentence[n - 1 - i::n].
+    Parameters:
+        sentence (str): The sentence to be deciphered, without its full stop.
+    Returns:
+        (string): The deciphered sentence, or None if the sentence is invalid.
+    Examples:
+    >>> decipher_sentence('BlHyoee l')
+    'Hello Bye'
+    >>> decipher_sentence('Hey2') is None
+    True
+    '''
+    n = sentence_side(sentence)
+    if not n:
+        return None
+    return add_space(_transform(sentence, 'decipher', n))
+
+
+def encipher_sentence(sentence):
+    '''
+    Enciphers a single sentence, the inverse of decipher_sentence. The sentence is padded
+    with spaces up to the next square length first.
+    Parameters:
+        sentence (str): The sentence to be enciphered, without its full stop.
+    Returns:
+        (string): The enciphered sentence, or None if the sentence contains characters other
+            than letters and spaces, is empty, or would be longer than 1000 characters once padded.
+    Examples:
+    >>> encipher_sentence('Hello Bye')
+    'BlHyoee l'
+    >>> encipher_sentence('Hi')
+    ' H i'
+    '''
+    length = len(sentence)
+    if length == 0 or is_not_valid(sentence):
+        return None
+    n = math.isqrt(length - 1) + 1
+    if n > MAX_SIDE:
+        return None
+    return _transform(sentence + PADDING_CHAR * (n * n - length), 'encipher', n)
+
+
+def encipher_code(input_string):
+    '''
+    Enciphers the input string sentence by sentence, the inverse of decipher_code.
+    The space that follows each full stop in deciphered text is dropped, and invalid
+    sentences are ignored. Deciphering the result gives back the input, except for the
+    padding spaces at the end of each sentence and any space add_space inserts.
+    Parameters:
+        input_string (str): The string to be enciphered.
+    Returns:
+        (string): The enciphered string with all valid sentences.
+    Examples:
+    >>> encipher_code('Hello Bye.')
+    'BlHyoee l.'
+    >>> decipher_code(encipher_code('Hello Bye. Hi'))
+    'Hello Bye. Hi  '
+    '''
+    enciphered_sentences = []
+    for i, sentence in enumerate(input_string.split('.')):
+        if i > 0 and sentence[:1] == ' ':
+            sentence = sentence[1:]
+        enciphered_sentence = encipher_sentence(sentence)
+        if enciphered_sentence is not None:
+            enciphered_sentences.append(enciphered_sentence)
+
+    result = '.'.join(enciphered_sentences)
+    if input_string and input_string[-1] == '.':
+        result += '.'
+    return result
+
+
 def decipher_code(input_string):
     '''
     Deciphers the input string by processing each sentence. Each sentence is converted to a list, 
@@ -233,21 +646,618 @@ def decipher_code(input_string):
     
     
     '''
-    sentences = input_string.split('.')
-    deciphered_sentences = []
-    for sentence in sentences:
-        # Check if the sentence is valid 
-        if not is_not_valid(sentence) and sentence != '':
-            sentence_2d = string2list(sentence)
-            
-            # Process the sentence only if string2list returned a valid 2D list
-            if sentence_2d:
-                flip_list(sentence_2d)
-                deciphered_sentence = list2string(sentence_2d)
-                deciphered_sentences.append(deciphered_sentence)
+    result = '. '.join(_decipher_shard(input_string))
+    if input_string and input_string[-1] == '.':
+        result += '.'
     
+    return result
+
+
+def _decipher_shard(shard, decipher=decipher_sentence):
+    # Deciphers every valid sentence of a piece of text, dropping the invalid ones
+    deciphered_sentences = []
+    for sentence in shard.split('.'):
+        deciphered_sentence = decipher(sentence)
+        if deciphered_sentence is not None:
+            deciphered_sentences.append(deciphered_sentence)
+    return deciphered_sentences
+
+
+def split_shards(input_string, shard_size=DEFAULT_SHARD_SIZE):
+    '''
+    Splits a string into pieces of about shard_size characters that each end
+    right after a full stop, so no sentence is cut in two.
+    Parameters:
+        input_string (str): The string to split.
+        shard_size (int): Minimum number of characters in each piece but the last.
+    Returns:
+        (list): The pieces, which join back into input_string.
+    Examples:
+    >>> split_shards('abcd.efgh.ijkl.mn', 6)
+    ['abcd.efgh.', 'ijkl.mn']
+    '''
+    shards = []
+    start = 0
+    while start < len(input_string):
+        end = input_string.find('.', start + shard_size - 1)
+        if end == -1:
+            shards.append(input_string[start:])
+            break
+        shards.append(input_string[start:end + 1])
+        start = end + 1
+    return shards
+
+
+def decipher_code_parallel(input_string, workers=None, shard_size=DEFAULT_SHARD_SIZE):
+    '''
+    Deciphers the input string like decipher_code, sharing its sentences out across a pool
+    of processes. Inputs no longer than one shard are deciphered serially.
+    Parameters:
+        input_string (str): The string to be deciphered.
+        workers (int): Number of worker processes. Defaults to the number of CPUs.
+        shard_size (int): Number of characters sent to a worker at a time.
+    Returns:
+        (string): The deciphered string, identical to the result of decipher_code.
+    Examples:
+    >>> decipher_code_parallel('BlHyoee l.' * 200000, shard_size=100000) == decipher_code('BlHyoee l.' * 200000)
+    True
+    '''
+    if len(input_string) <= shard_size or workers == 1:
+        return decipher_code(input_string)
+
+    deciphered_sentences = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map returns the shards in order, whichever worker finishes first
+        for sentences in executor.map(_decipher_shard, split_shards(input_string, shard_size)):
+            deciphered_sentences.extend(sentences)
+
     result = '. '.join(deciphered_sentences)
+    if input_string[-1] == '.':
+        result += '.'
+    return result
+
+
+def decipher_stream(stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    Deciphers text read from a file or stream one chunk at a time, yielding the output
+    as soon as each sentence ends, so neither the input nor the output has to fit in memory.
+    Joining everything it yields gives the same string as decipher_code on the whole input.
+    Parameters:
+        stream (file): A text file or stream with a read method.
+        chunk_size (int): Number of characters read at a time.
+    Returns:
+        (generator): Yields deciphered sentences with their separators.
+    Examples:
+    >>> import io
+    >>> list(decipher_stream(io.StringIO('BlHyoee l.BlHyoee l.'), 4))
+    ['Hello Bye', '. Hello Bye', '.']
+    '''
+    pending = ''
+    # True while reading a sentence already too long to be valid
+    skipping = False
+    separator = ''
+    last_char = ''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        last_char = chunk[-1]
+        sentences = chunk.split('.')
+        if skipping:
+            if len(sentences) == 1:
+                continue
+            # The first piece ends the sentence being skipped
+            sentences[0] = ''
+            skipping = False
+        else:
+            sentences[0] = pending + sentences[0]
+
+        for sentence in sentences[:-1]:
+            deciphered_sentence = decipher_sentence(sentence)
+            if deciphered_sentence is not None:
+                yield separator + deciphered_sentence
+                separator = '. '
+
+        pending = sentences[-1]
+        if len(pending) > MAX_SENTENCE_LENGTH:
+            pending = ''
+            skipping = True
+
+    if not skipping:
+        deciphered_sentence = decipher_sentence(pending)
+        if deciphered_sentence is not None:
+            yield separator + deciphered_sentence
+    if last_char == '.':
+        yield '.'
+
+
+def decipher_file(input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    Deciphers a text file of any size into another file using decipher_stream.
+    Parameters:
+        input_path (str): Path of the file to decipher.
+        output_path (str): Path of the file to write the deciphered text to.
+        chunk_size (int): Number of characters read at a time.
+    Returns:
+        None(NoneType)
+    Examples:
+    >>> decipher_file('intercepts.txt', 'deciphered.txt')
+    '''
+    with open(input_path, 'r') as input_file, open(output_path, 'w') as output_file:
+        output_file.writelines(decipher_stream(input_file, chunk_size))
+
+
+@lru_cache(maxsize=1 << 16)
+def score_sentence(sentence):
+    '''
+    Scores how much a deciphered sentence looks like English, as the share of its
+    characters that belong to words of COMMON_WORDS. Results are cached.
+    Parameters:
+        sentence (str): A deciphered sentence.
+    Returns:
+        (float): Score between 0.0 and 1.0.
+    Examples:
+    >>> score_sentence('Meet me at dawn')
+    0.8
+    >>> score_sentence('xq zzv')
+    0.0
+    '''
+    if not sentence:
+        return 0.0
+    matched = sum(len(word) for word in sentence.lower().split() if word in COMMON_WORDS)
+    return matched / len(sentence)
+
+
+def candidate_chains(max_length=DEFAULT_MAX_CHAIN_LENGTH, operations=CRACK_OPERATIONS, max_shift=0):
+    '''
+    Enumerates every chain of up to max_length operations.
+    Parameters:
+        max_length (int): Largest number of operations in a chain. Defaults to 3.
+        operations (tuple): Names of the operations to combine.
+        max_shift (int): Also combines row and column shifts by 1 to max_shift. Defaults to 0.
+    Returns:
+        (generator): Yields TransformChain objects, shortest first.
+    Examples:
+    >>> len(list(candidate_chains(2, ('transpose', 'rotate_90'))))
+    7
+    '''
+    steps = list(operations)
+    for k in range(1, max_shift + 1):
+        steps += [('row_shift', k), ('col_shift', k)]
+    for length in range(max_length + 1):
+        for chain in itertools.product(steps, repeat=length):
+            yield TransformChain(chain)
+
+
+# Sentences and pruning settings of the cracking worker processes, set by _init_crack_worker
+_crack_sentences = []
+_crack_prune = (DEFAULT_PRUNE_AFTER, DEFAULT_PRUNE_BELOW)
+
+
+def _init_crack_worker(sentences, prune_after, prune_below):
+    global _crack_sentences, _crack_prune
+    _crack_sentences = sentences
+    _crack_prune = (prune_after, prune_below)
+
+
+def _score_chain(operations):
+    # Length weighted score of a chain, or None once its first sentences score too low
+    chain = TransformChain(operations)
+    prune_after, prune_below = _crack_prune
+    total = 0.0
+    length = 0
+    for count, sentence in enumerate(_crack_sentences, 1):
+        deciphered_sentence = chain.decipher_sentence(sentence)
+        total += score_sentence(deciphered_sentence) * len(deciphered_sentence)
+        length += len(deciphered_sentence)
+        if count == prune_after and total / length < prune_below:
+            return None
+    return total / length
+
+
+def crack_code(input_string, top_k=DEFAULT_TOP_K, max_length=DEFAULT_MAX_CHAIN_LENGTH, max_shift=0,
+               workers=None, prune_after=DEFAULT_PRUNE_AFTER, prune_below=DEFAULT_PRUNE_BELOW):
+    '''
+    Looks for the transform chain a message was enciphered with. Every candidate chain
+    deciphers the message and is scored with score_sentence. Chains that act the same on
+    every sentence size of the message are only tried once, and a chain is dropped as soon
+    as its first prune_after sentences score below prune_below.
+    Parameters:
+        input_string (str): The enciphered string.
+        top_k (int): Number of candidates returned. Defaults to 5.
+        max_length (int): Largest number of operations in a chain. Defaults to 3.
+        max_shift (int): Also tries row and column shifts by 1 to max_shift. Defaults to 0.
+        workers (int): Number of worker processes, 1 to run serially. Defaults to the number of CPUs.
+        prune_after (int): Number of sentences scored before pruning. Defaults to 3.
+        prune_below (float): Lowest score a chain may have after prune_after sentences.
+    Returns:
+        (list): Up to top_k (score, TransformChain, deciphered string) tuples, best first.
+    Examples:
+    >>> score, chain, text = crack_code(encipher_code('Meet me at dawn. Send help'), workers=1)[0]
+    >>> text
+    'Meet me at dawn . Send help'
+    '''
+    sentences = [sentence for sentence in input_string.split('.') if sentence_side(sentence)]
+    if not sentences:
+        return []
+
+    # Keeping one chain per distinct permutation over the sizes found in the message
+    sizes = sorted({sentence_side(sentence) for sentence in sentences})
+    unique_chains = {}
+    for chain in candidate_chains(max_length, max_shift=max_shift):
+        key = tuple(chain.permutation(n) for n in sizes)
+        unique_chains.setdefault(key, chain)
+    chains = list(unique_chains.values())
+    operations = [chain.operations for chain in chains]
+
+    if workers == 1:
+        _init_crack_worker(sentences, prune_after, prune_below)
+        scores = list(map(_score_chain, operations))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_crack_worker,
+                                 initargs=(sentences, prune_after, prune_below)) as executor:
+            scores = list(executor.map(_score_chain, operations, chunksize=16))
+
+    ranked = sorted(((score, chain) for score, chain in zip(scores, chains) if score is not None),
+                    key=lambda candidate: candidate[0], reverse=True)
+    return [(score, chain, chain.decipher_code(input_string)) for score, chain in ranked[:top_k]]
+
+
+def generate_corpus(sentence_count, profile='uniform', seed=0):
+    '''
+    Generates a synthetic plain text corpus whose sentence lengths are square numbers
+    drawn from one of the BENCHMARK_PROFILES.
+    Parameters:
+        sentence_count (int): Number of sentences.
+        profile (str): One of the keys of BENCHMARK_PROFILES.
+        seed (int): Seed of the random generator, so the corpus can be reproduced.
+    Returns:
+        (string): Sentences of lowercase letters and spaces joined by '. '.
+    Examples:
+    >>> len(generate_corpus(3, 'short').split('. '))
+    3
+    '''
+    generator = random.Random(seed)
+    smallest, largest = BENCHMARK_PROFILES[profile]
+    sentences = []
+    for _ in range(sentence_count):
+        n = generator.randint(smallest, largest)
+        sentences.append(''.join(generator.choices(BENCHMARK_ALPHABET, k=n * n)))
+    return '. '.join(sentences)
+
+
+def _decipher_code_reference(input_string):
+    # decipher_code through the nested-list implementation
+    result = '. '.join(deciphered_sentence for deciphered_sentence in
+                       map(decipher_sentence_reference, input_string.split('.'))
+                       if deciphered_sentence is not None)
     if input_string and input_string[-1] == '.':
         result += '.'
-    
     return result
+
+
+def benchmark_decoder(sentence_count=10000, profiles=tuple(BENCHMARK_PROFILES), repeat=3):
+    '''
+    Measures the throughput of enciphering, deciphering with the fast and the nested-list
+    paths, and a full round trip over a synthetic corpus of each profile.
+    Parameters:
+        sentence_count (int): Number of sentences in each corpus.
+        profiles (tuple): Keys of BENCHMARK_PROFILES to run.
+        repeat (int): Number of runs of each operation, the fastest one being kept.
+    Returns:
+        (list): One dictionary per profile and operation with the keys 'profile', 'operation',
+            'seconds', 'sentences_per_second' and 'mb_per_second'.
+    Examples:
+    >>> results = benchmark_decoder(100, ('short',), 1)
+    >>> [result['operation'] for result in results]
+    ['encipher', 'decipher', 'decipher_reference', 'round_trip']
+    '''
+    results = []
+    for profile in profiles:
+        plain_text = generate_corpus(sentence_count, profile)
+        cipher_text = encipher_code(plain_text)
+        operations = [('encipher', encipher_code, plain_text),
+                      ('decipher', decipher_code, cipher_text),
+                      ('decipher_reference', _decipher_code_reference, cipher_text),
+                      ('round_trip', lambda text: decipher_code(encipher_code(text)), plain_text)]
+        for operation, function, text in operations:
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                function(text)
+                best = min(best, time.perf_counter() - start)
+            best = max(best, 1e-9)
+            results.append({'profile': profile, 'operation': operation, 'seconds': best,
+                            'sentences_per_second': sentence_count / best,
+                            'mb_per_second': len(text) / 1e6 / best})
+    return results
+
+
+def _decipher_batch(messages):
+    # Runs in a worker process, one call per batch of messages
+    return [decipher_code(message) for message in messages]
+
+
+async def _skip_line(reader):
+    # Drops the rest of a line too long to be read, up to and including its newline
+    while True:
+        try:
+            await reader.readuntil(b'\n')
+            return
+        except asyncio.LimitOverrunError as error:
+            await reader.readexactly(error.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+class DecoderService:
+    '''
+    Local asyncio service deciphering messages sent one per line over TCP or a Unix socket.
+    Lines longer than MAX_MESSAGE_BYTES are answered with an error and skipped.
+    A client is not read from while MAX_PENDING_PER_CLIENT of its lines are unanswered,
+    and the lines it leaves unanswered when it disconnects are never deciphered.
+    Messages arriving together, from any number of connections, are grouped into batches
+    and deciphered on a process pool. Each message gets back one JSON line with its result,
+    its latency in milliseconds and the size of the batch it was deciphered in.
+    Instance Attributes:
+        max_batch (int): Largest number of messages deciphered together.
+        max_delay (float): Longest time in seconds a message waits for a batch to fill.
+        workers (int): Number of worker processes, None for the number of CPUs.
+        requests (int): Number of messages deciphered so far.
+        batches (int): Number of batches deciphered so far.
+    '''
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY, workers=None):
+        '''
+        Creates a service, which starts when serve is awaited.
+        Parameters:
+            max_batch (int): Largest number of messages deciphered together. Defaults to 64.
+            max_delay (float): Longest wait in seconds for a batch to fill. Defaults to 0.005.
+            workers (int): Number of worker processes. Defaults to the number of CPUs.
+        Examples:
+        $ python "Secret Message decoder.py" serve --port 8765 --max-batch 16
+        '''
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.workers = workers
+        self.requests = 0
+        self.batches = 0
+        self._queue = None
+        self._executor = None
+
+
+    async def decipher(self, message):
+        '''
+        Deciphers one message through the batching queue.
+        Parameters:
+            message (str): The string to be deciphered.
+        Returns:
+            (dict): The keys 'result', 'latency_ms' and 'batch_size'.
+        '''
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((message, future, time.perf_counter()))
+        return await future
+
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        # Keeps up to one batch per worker in flight while the next ones are collected
+        slots = asyncio.Semaphore(self.workers or os.cpu_count() or 1)
+        running = set()
+        try:
+            while True:
+                await slots.acquire()
+                batch = await self._collect_batch(loop)
+                # Spreading a large batch over every idle worker
+                parts = 1
+                while parts < len(batch) and not slots.locked():
+                    await slots.acquire()
+                    parts += 1
+                for part in range(parts):
+                    task = asyncio.create_task(self._finish_batch(
+                        loop, batch[part * len(batch) // parts:(part + 1) * len(batch) // parts]))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+                    task.add_done_callback(lambda _: slots.release())
+        finally:
+            for task in list(running):
+                task.cancel()
+
+
+    async def _collect_batch(self, loop):
+        # Requests cancelled while queued, such as those of a client that left, are dropped
+        batch = []
+        while not batch:
+            entry = await self._queue.get()
+            if not entry[1].done():
+                batch.append(entry)
+        deadline = loop.time() + self.max_delay
+        # Waiting a little for more messages to share the trip to the workers
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                entry = self._queue.get_nowait()
+            else:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if not entry[1].done():
+                batch.append(entry)
+        return batch
+
+
+    async def _finish_batch(self, loop, batch):
+        messages = [message for message, _, _ in batch]
+        try:
+            results = await loop.run_in_executor(self._executor, _decipher_batch, messages)
+        except Exception as error:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        self.batches += 1
+        self.requests += len(batch)
+        finished = time.perf_counter()
+        for (_, future, started), result in zip(batch, results):
+            if not future.done():
+                future.set_result({'result': result,
+                                   'latency_ms': (finished - started) * 1000,
+                                   'batch_size': len(batch)})
+
+
+    async def _handle_client(self, reader, writer):
+        # Answers in request order while later lines of the same client are already queued.
+        # A client with too many unanswered lines is not read from until it catches up
+        pending = asyncio.Queue(MAX_PENDING_PER_CLIENT)
+
+        def cancel_pending():
+            # Stops the requests nobody is left to answer from using the workers
+            while not pending.empty():
+                task = pending.get_nowait()
+                if task is not None:
+                    task.cancel()
+
+        async def write_responses():
+            while True:
+                task = await pending.get()
+                if task is None:
+                    break
+                try:
+                    response = await task
+                except Exception as error:
+                    response = {'error': str(error)}
+                try:
+                    writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                    await writer.drain()
+                except ConnectionError:
+                    cancel_pending()
+                    break
+
+        writer_task = asyncio.create_task(write_responses())
+        try:
+            while not writer_task.done():
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as error:
+                    # The last line may end without a newline
+                    line = error.partial
+                except ConnectionError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await _skip_line(reader)
+                    too_long = asyncio.get_running_loop().create_future()
+                    too_long.set_result({'error': "Message longer than "
+                                         + str(MAX_MESSAGE_BYTES) + " bytes!"})
+                    await pending.put(too_long)
+                    continue
+                if not line:
+                    break
+                message = line.decode('utf-8', errors='replace').rstrip('\r\n')
+                await pending.put(asyncio.create_task(self.decipher(message)))
+        finally:
+            try:
+                # A writer that stopped on a lost connection no longer empties the queue
+                if not writer_task.done():
+                    await pending.put(None)
+                await writer_task
+            finally:
+                cancel_pending()
+                writer.close()
+
+
+    async def serve(self, host=SERVICE_HOST, port=SERVICE_PORT, path=None):
+        '''
+        Runs the service until it is cancelled.
+        Parameters:
+            host (str): Address to listen on. Defaults to localhost.
+            port (int): TCP port to listen on. Defaults to 8765.
+            path (str): Path of a Unix socket to listen on instead of TCP.
+        Returns:
+            None(NoneType)
+        '''
+        self._queue = asyncio.Queue()
+        with ProcessPoolExecutor(max_workers=self.workers) as self._executor:
+            # Starting the workers before any connection is accepted, so forked workers
+            # do not inherit client sockets and keep them open after the client is done
+            await asyncio.get_running_loop().run_in_executor(self._executor, _decipher_batch, [])
+            batcher = asyncio.create_task(self._run_batches())
+            if path is not None:
+                server = await asyncio.start_unix_server(self._handle_client, path=path,
+                                                         limit=MAX_MESSAGE_BYTES)
+            else:
+                server = await asyncio.start_server(self._handle_client, host, port,
+                                                    limit=MAX_MESSAGE_BYTES)
+            try:
+                async with server:
+                    await server.serve_forever()
+            finally:
+                batcher.cancel()
+
+
+def main(argv=None):
+    '''
+    Command line entry point.
+    Examples:
+    $ python "Secret Message decoder.py" decipher intercepts.txt deciphered.txt
+    $ python "Secret Message decoder.py" benchmark --sentences 10000
+    $ python "Secret Message decoder.py" serve --port 8765
+    $ python "Secret Message decoder.py" crack intercept.txt --top-k 3
+    '''
+    parser = argparse.ArgumentParser(description="Decipher secret messages.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    decipher_parser = commands.add_parser("decipher", help="decipher a file of any size")
+    decipher_parser.add_argument("input", help="path of the file to decipher")
+    decipher_parser.add_argument("output", help="path of the file to write to")
+    decipher_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                                 help="characters read at a time")
+    benchmark_parser = commands.add_parser("benchmark", help="measure encipher and decipher throughput")
+    benchmark_parser.add_argument("--sentences", type=int, default=10000, help="sentences per corpus")
+    benchmark_parser.add_argument("--repeat", type=int, default=3, help="runs of each operation")
+    benchmark_parser.add_argument("--profile", choices=sorted(BENCHMARK_PROFILES), action="append",
+                                  help="sentence length profile, may be repeated (default: all)")
+    serve_parser = commands.add_parser("serve", help="run a local batching decoder service")
+    serve_parser.add_argument("--host", default=SERVICE_HOST, help="address to listen on")
+    serve_parser.add_argument("--port", type=int, default=SERVICE_PORT, help="TCP port to listen on")
+    serve_parser.add_argument("--unix-socket", help="listen on this Unix socket path instead of TCP")
+    serve_parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                              help="largest number of messages deciphered together")
+    serve_parser.add_argument("--max-delay", type=float, default=DEFAULT_MAX_DELAY,
+                              help="longest wait in seconds for a batch to fill")
+    serve_parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    crack_parser = commands.add_parser("crack", help="search for the transform chain of a message")
+    crack_parser.add_argument("input", help="path of the file holding the enciphered message")
+    crack_parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="candidates to show")
+    crack_parser.add_argument("--max-length", type=int, default=DEFAULT_MAX_CHAIN_LENGTH,
+                              help="largest number of operations in a chain")
+    crack_parser.add_argument("--max-shift", type=int, default=0, help="largest row or column shift to try")
+    crack_parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    if args.command == "decipher":
+        decipher_file(args.input, args.output, args.chunk_size)
+    elif args.command == "benchmark":
+        profiles = args.profile or tuple(BENCHMARK_PROFILES)
+        print("profile   operation            sentences/s        MB/s")
+        for result in benchmark_decoder(args.sentences, profiles, args.repeat):
+            print(f"{result['profile']:<9} {result['operation']:<18} "
+                  f"{result['sentences_per_second']:>13.0f} {result['mb_per_second']:>11.2f}")
+    elif args.command == "crack":
+        with open(args.input, 'r') as input_file:
+            input_string = input_file.read()
+        for score, chain, text in crack_code(input_string, args.top_k, args.max_length,
+                                             args.max_shift, args.workers):
+            print(f"{score:.3f}", chain, text, sep="\t")
+    elif args.command == "serve":
+        service = DecoderService(args.max_batch, args.max_delay, args.workers)
+        try:
+            asyncio.run(service.serve(args.host, args.port, args.unix_socket))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()